@@ -0,0 +1,124 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+import time
+from typing import Any
+from settings import CFG_DIR
+
+# ─── Download archive ───
+_DB = os.path.join(CFG_DIR, 'archive.db')
+_YT_ID = re.compile(r'\[([A-Za-z0-9_-]{11})\]\.[^.]+$')
+
+Key = tuple[str, str, str, str]
+
+
+def ident(url: str) -> tuple[str, str] | None:
+    """Map a URL to (extractor, id) offline, using the extractors' URL patterns."""
+    from yt_dlp.extractor import gen_extractor_classes
+    for ie in gen_extractor_classes():
+        if ie.ie_key() == 'Generic' or not ie.suitable(url):
+            continue
+        try:
+            vid = ie.get_temp_id(url)
+        except Exception:
+            vid = None
+        return (ie.ie_key().lower(), str(vid)) if vid else None
+    return None
+
+
+def info_key(info: dict[str, Any], fmt: str, qual: str) -> Key | None:
+    ex = info.get('extractor_key') or info.get('ie_key')
+    vid = info.get('id')
+    return (ex.lower(), str(vid), fmt, qual) if ex and vid else None
+
+
+def _under(path: str, folder: str) -> bool:
+    try:
+        folder = os.path.abspath(folder)
+        return os.path.commonpath([os.path.abspath(path), folder]) == folder
+    except ValueError:  # different drives
+        return False
+
+
+def info_path(info: dict[str, Any]) -> str:
+    for d in info.get('requested_downloads') or ():
+        if d.get('filepath'):
+            return d['filepath']
+    return info.get('filepath') or ''
+
+
+class Archive:
+    """SQLite record of fetched media, mirrored in memory for O(1) lookups."""
+
+    def __init__(self, path: str = _DB) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS media ('
+            'extractor TEXT, id TEXT, fmt TEXT, qual TEXT, path TEXT, added REAL, '
+            'PRIMARY KEY (extractor, id, fmt, qual)) WITHOUT ROWID')
+        self._db.commit()
+        self._mem: dict[Key, str] = {
+            tuple(r[:4]): r[4] for r in self._db.execute(
+                'SELECT extractor, id, fmt, qual, path FROM media')}
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def has(self, key: Key | None, folder: str = '') -> bool:
+        """Whether `key` was fetched, and if `folder` is given, still lies in it."""
+        if key is None or key not in self._mem:
+            return False
+        path = self._mem[key]
+        if not path:
+            return not folder
+        return (not folder or _under(path, folder)) and os.path.exists(path)
+
+    def add(self, key: Key | None, path: str = '') -> None:
+        if key is not None:
+            self.add_many([(key, path)])
+
+    def add_many(self, rows: list[tuple[Key, str]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?)',
+                [(*k, p, now) for k, p in rows])
+            self._db.commit()
+            for k, p in rows:
+                self._mem[k] = p
+
+    def import_dir(self, folder: str, fmt: str, qual: str) -> int:
+        """Record media already in `folder`: yt-dlp .info.json files and `[id]` names.
+
+        Those come from yt-dlp's own default template or --write-info-json;
+        this app names files by title only, so its downloads are recorded as
+        they finish rather than found here.
+        """
+        rows: list[tuple[Key, str]] = []
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith('.info.json'):
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            key = info_key(json.load(f), fmt, qual)
+                    except Exception:
+                        continue
+                    if key:
+                        rows.append((key, path))
+                    continue
+                m = _YT_ID.search(name)
+                if m:
+                    rows.append((('youtube', m.group(1), fmt, qual), path))
+        if rows:
+            self.add_many(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,346 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from cli import QUALITIES
+from engine import Engine, Job
+from pipeline import Transcoder
+
+# ─── Offline benchmark ───
+# python bench.py --latency 50 --bandwidth 2048 --json out.json
+# python bench.py --baseline out.json   (exit 1 on regression)
+_TYPES = {'.mp4': 'video/mp4', '.m4a': 'audio/mp4', '.mpd': 'application/dash+xml'}
+_HEIGHTS = {'360p': (640, 360), '480p': (854, 480), '720p': (1280, 720), '1080p': (1920, 1080)}
+_MPD = ('<?xml version="1.0"?>\n'
+        '<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" '
+        'mediaPresentationDuration="PT{duration}S" '
+        'profiles="urn:mpeg:dash:profile:isoff-on-demand:2011"><Period>'
+        '<AdaptationSet contentType="video" mimeType="video/mp4">{video}</AdaptationSet>'
+        '<AdaptationSet contentType="audio" mimeType="audio/mp4">'
+        '<Representation id="audio" codecs="mp4a.40.2" bandwidth="160000">'
+        '<BaseURL>{audio}</BaseURL></Representation></AdaptationSet></Period></MPD>\n')
+# metric: (+1 higher is better / -1 lower is better, ignored absolute change)
+_GATE = {'throughput_bps': (1, 64 << 10), 'ttfb_s': (-1, 0.02),
+         'post_s': (-1, 0.05), 'hook_us': (-1, 2.0)}
+
+
+class _Stub(ThreadingHTTPServer):
+    """Serves files from `root` with injected latency and per-connection bandwidth."""
+    daemon_threads = True
+
+    def __init__(self, root: str, latency: float, bandwidth: int, ranges: bool) -> None:
+        self.root, self.latency, self.bandwidth, self.ranges = root, latency, bandwidth, ranges
+        super().__init__(('127.0.0.1', 0), _Handler)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: _Stub
+
+    def do_HEAD(self) -> None:
+        self._send(False)
+
+    def do_GET(self) -> None:
+        self._send(True)
+
+    def _send(self, body: bool) -> None:
+        path = os.path.join(self.server.root, os.path.basename(self.path.split('?')[0]))
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        m = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range', ''))
+        if m and self.server.ranges:
+            start, end = int(m[1]), min(int(m[2]) if m[2] else end, end)
+        time.sleep(self.server.latency)
+        self.send_response(206 if m and self.server.ranges else 200)
+        self.send_header('Content-Type', _TYPES.get(os.path.splitext(path)[1], 'application/octet-stream'))
+        self.send_header('Content-Length', str(end - start + 1))
+        if self.server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+            if m:
+                self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if body:
+            self._copy(path, start, end - start + 1)
+
+    def _copy(self, path: str, start: int, left: int) -> None:
+        bw = self.server.bandwidth
+        chunk = min(64 << 10, bw or 64 << 10)
+        t0, sent = time.monotonic(), 0
+        try:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                while left > 0:
+                    buf = f.read(min(chunk, left))
+                    if not buf:
+                        return
+                    self.wfile.write(buf)
+                    left -= len(buf)
+                    sent += len(buf)
+                    if bw:
+                        ahead = sent / bw - (time.monotonic() - t0)
+                        if ahead > 0:
+                            time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *a: Any) -> None:
+        pass
+
+
+def _media(root: str, duration: float, size_mb: float) -> dict[str, str]:
+    """One clip per MP4 height plus an AAC track; random bytes without ffmpeg.
+
+    With ffmpeg the clips are video-only and listed next to the audio in a
+    DASH manifest ('manifest'), so MP4 cells pick bestvideo+bestaudio and
+    the merge is part of what gets measured.
+    """
+    names = {q: f'v{h}.mp4' for q, (_, h) in _HEIGHTS.items()}
+    names['audio'] = 'a.m4a'
+    ff = shutil.which('ffmpeg')
+    if not ff:
+        for name in names.values():
+            with open(os.path.join(root, name), 'wb') as f:
+                f.write(os.urandom(int(size_mb * (1 << 20))))
+        return names
+    base = [ff, '-y', '-loglevel', 'error', '-f', 'lavfi', '-i']
+    reps = []
+    for q, name in names.items():
+        dst = os.path.join(root, name)
+        if q == 'audio':
+            cmd = base + [f'sine=frequency=440:duration={duration}', '-c:a', 'aac', '-b:a', '160k',
+                          '-movflags', '+faststart', dst]
+            if subprocess.run(cmd, capture_output=True).returncode != 0:
+                raise RuntimeError(f'ffmpeg could not generate {name}')
+            continue
+        w, h = _HEIGHTS[q]
+        for vcodec, tag in (('libx264', 'avc1.64001f'), ('mpeg4', 'mp4v.20.9')):
+            cmd = base + [f'testsrc2=size={w}x{h}:rate=25:duration={duration}', '-c:v', vcodec,
+                          '-an', '-movflags', '+faststart', dst]
+            if subprocess.run(cmd, capture_output=True).returncode == 0:
+                reps.append(f'<Representation id="{q}" codecs="{tag}" width="{w}" height="{h}" '
+                            f'bandwidth="{h * 4000}"><BaseURL>{name}</BaseURL></Representation>')
+                break
+        else:
+            raise RuntimeError(f'ffmpeg could not generate {name}')
+    names['manifest'] = 'media.mpd'
+    with open(os.path.join(root, names['manifest']), 'w', encoding='utf-8') as f:
+        f.write(_MPD.format(duration=duration, video=''.join(reps), audio=names['audio']))
+    return names
+
+
+def _rss_mb() -> tuple[float, float] | None:
+    """Peak RSS of this process and of reaped children (ffmpeg), in MiB.
+
+    Both are lifetime peaks, which is why every cell runs in its own process.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    div = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / div,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / div)
+
+
+class _Timed(Engine):
+    """Engine that timestamps each job's bytes and times the progress hook."""
+
+    def __init__(self, *a: Any, **kw: Any) -> None:
+        self.marks: dict[int, dict[str, Any]] = {}
+        super().__init__(*a, **kw)
+
+    def _mark(self, job: Job) -> dict[str, Any]:
+        return self.marks.setdefault(job.id, {'first': None, 'last': None, 'end': None,
+                                              'bytes': 0, 'calls': 0, 'hook_s': 0.0})
+
+    def _hook(self, job: Job, d: dict) -> None:
+        t = time.perf_counter()
+        super()._hook(job, d)
+        m = self._mark(job)
+        m['hook_s'] += time.perf_counter() - t
+        m['calls'] += 1
+        if d.get('downloaded_bytes'):
+            m['first'] = m['first'] or t
+            m['last'] = t
+            m['bytes'] = max(m['bytes'], d['downloaded_bytes'])
+        elif d.get('status') == 'finished':
+            m['last'] = t
+
+    def _finish(self, job: Job) -> None:
+        self._mark(job)['end'] = time.perf_counter()
+        super()._finish(job)
+
+
+class _Job(Job):
+    def opts(self) -> dict[str, Any]:
+        return {**super().opts(), 'quiet': True, 'noprogress': True}
+
+
+def _cell(engine: _Timed, url: str, fmt: str, qual: str) -> dict[str, Any]:
+    out = tempfile.mkdtemp(prefix='ezbench-')
+    try:
+        t0 = time.perf_counter()
+        job = engine.submit(_Job(url, 'Bench', fmt, qual, out))
+        engine.wait()
+        m = engine.marks.pop(job.id)
+        first, last, end = m['first'], m['last'], m['end'] or time.perf_counter()
+        dl = (last - first) if first and last else 0.0
+        return {'ok': job.state == 'done', 'error': job.error.strip(),
+                'bytes': m['bytes'],
+                'throughput_bps': round(m['bytes'] / dl) if dl > 0 else 0,
+                'ttfb_s': round(first - t0, 4) if first else None,
+                'download_s': round(dl, 4),
+                'post_s': round(end - last, 4) if last else None,
+                'hook_calls': m['calls'],
+                'hook_us': round(m['hook_s'] / m['calls'] * 1e6, 2) if m['calls'] else 0.0}
+    finally:
+        shutil.rmtree(out, ignore_errors=True)
+
+
+def _median(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    res = dict(runs[-1])
+    for k in runs[-1]:
+        vals = [r[k] for r in runs if isinstance(r[k], (int, float)) and not isinstance(r[k], bool)]
+        if vals and len(vals) == len(runs):
+            res[k] = statistics.median_low(vals)
+    res['ok'] = all(r['ok'] for r in runs)
+    return res
+
+
+def _run_cell(args: argparse.Namespace) -> dict[str, Any]:
+    """The --cell child: `repeat` runs of one format/quality against --url."""
+    fmt, qual = args.cell.split(':', 1)
+    engine = _Timed(1, transcoder=Transcoder() if shutil.which('ffmpeg') else None,
+                    stream_audio=args.stream_audio, segments=args.segments)
+    try:
+        res = _median([_cell(engine, args.url, fmt, qual) for _ in range(args.repeat)])
+    finally:
+        if engine.transcoder:
+            engine.transcoder.shutdown()
+    rss = _rss_mb()
+    if rss:
+        res['peak_rss_mb'], res['peak_child_rss_mb'] = round(rss[0], 1), round(rss[1], 1)
+    return res
+
+
+def _spawn(args: argparse.Namespace, url: str, fmt: str, qual: str) -> dict[str, Any]:
+    cmd = [sys.executable, os.path.abspath(__file__), '--cell', f'{fmt}:{qual}', '--url', url,
+           '--segments', str(args.segments), '--repeat', str(args.repeat)]
+    if args.stream_audio:
+        cmd.append('--stream-audio')
+    r = subprocess.run(cmd, capture_output=True, text=True)
+    lines = r.stdout.strip().splitlines()
+    if r.returncode == 0 and lines:
+        return json.loads(lines[-1])
+    return {'ok': False, 'error': r.stderr.strip()[-500:], 'throughput_bps': 0,
+            'ttfb_s': None, 'post_s': None, 'hook_us': 0.0}
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    root = tempfile.mkdtemp(prefix='ezbench-media-')
+    try:
+        names = _media(root, args.duration, args.size_mb)
+        srv = _Stub(root, args.latency / 1000, args.bandwidth << 10, not args.no_range)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        results = []
+        for fmt, quals in QUALITIES.items():
+            for qual in quals:
+                if args.only and f'{fmt}:{qual}' not in args.only:
+                    continue
+                if fmt == 'MP3':
+                    name = names['audio']
+                else:
+                    name = names.get('manifest', names[qual])
+                res = _spawn(args, srv.url + name, fmt, qual)
+                results.append({'format': fmt, 'quality': qual, **res})
+                print(f"{fmt:4} {qual:6} {'ok' if res['ok'] else 'FAIL':4} "
+                      f"{res['throughput_bps'] / (1 << 20):7.2f} MiB/s  ttfb {res['ttfb_s']}s  "
+                      f"post {res['post_s']}s  hook {res['hook_us']}us", file=sys.stderr)
+        srv.shutdown()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return {'meta': {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                     'platform': sys.platform, 'ffmpeg': bool(shutil.which('ffmpeg')),
+                     'merge': 'manifest' in names,
+                     'latency_ms': args.latency, 'bandwidth_kb': args.bandwidth,
+                     'ranges': not args.no_range, 'segments': args.segments,
+                     'stream_audio': args.stream_audio, 'repeat': args.repeat},
+            'results': results}
+
+
+def regressions(base: dict[str, Any], cur: dict[str, Any], tolerance: float) -> list[str]:
+    """Metrics in `cur` worse than `base` by more than `tolerance` (a fraction)."""
+    old = {(r['format'], r['quality']): r for r in base['results']}
+    bad = []
+    for r in cur['results']:
+        b = old.get((r['format'], r['quality']))
+        if b is None or not b['ok']:
+            continue
+        if not r['ok']:
+            bad.append(f"{r['format']} {r['quality']}: failed ({r['error']})")
+            continue
+        for k, (sign, slack) in _GATE.items():
+            if b.get(k) is None or r.get(k) is None:
+                continue
+            worse = (b[k] - r[k]) * sign
+            if worse > slack and worse > abs(b[k]) * tolerance:
+                bad.append(f"{r['format']} {r['quality']}: {k} {b[k]} -> {r[k]}")
+    return bad
+
+
+def main(argv: list[str]) -> int:
+    p = argparse.ArgumentParser(prog='bench.py', description='EasyDownload offline benchmark')
+    p.add_argument('--latency', type=float, default=0, help='ms before each response')
+    p.add_argument('--bandwidth', type=int, default=0, help='KB/s per connection (0 = unlimited)')
+    p.add_argument('--no-range', action='store_true', help='server ignores Range requests')
+    p.add_argument('--duration', type=float, default=10, help='clip length in seconds (ffmpeg)')
+    p.add_argument('--size-mb', type=float, default=8, help='file size without ffmpeg')
+    p.add_argument('--segments', type=int, default=4, help='ranged connections per file')
+    p.add_argument('--stream-audio', action='store_true', help='encode audio while downloading')
+    p.add_argument('--repeat', type=int, default=3, help='runs per cell (median is kept)')
+    p.add_argument('--only', nargs='*', metavar='FMT:QUAL', help='e.g. MP3:320 MP4:720p')
+    p.add_argument('--json', metavar='FILE', help='write results here instead of stdout')
+    p.add_argument('--baseline', metavar='FILE', help='earlier results to gate against')
+    p.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown fraction')
+    p.add_argument('--cell', help=argparse.SUPPRESS)
+    p.add_argument('--url', help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args.cell:
+        print(json.dumps(_run_cell(args)))
+        return 0
+    res = run(args)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(res, f, indent=2)
+    else:
+        json.dump(res, sys.stdout, indent=2)
+        print()
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        bad = regressions(json.load(f), res, args.tolerance)
+    for line in bad:
+        print(f'regression: {line}', file=sys.stderr)
+    return 1 if bad else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
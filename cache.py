@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+from settings import CFG_DIR
+
+# ─── Extraction cache ───
+_DIR = os.path.join(CFG_DIR, 'cache')
+
+
+def _clean(info: dict[str, Any]) -> dict[str, Any]:
+    # Drop post-extraction callables and make the rest JSON-safe.
+    info = {k: v for k, v in info.items() if not callable(v)}
+    return json.loads(json.dumps(info, default=str))
+
+
+class InfoCache:
+    """Raw `extract_info(process=False)` results, in memory and on disk.
+
+    Entries expire after `ttl` seconds (stream URLs are only valid for a
+    while); both tiers evict least-recently-used entries beyond `size`.
+    """
+
+    def __init__(self, path: str = _DIR, ttl: float = 1800, size: int = 256) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.size = max(1, int(size))
+        self.hits = 0
+        self.misses = 0
+        self._mem: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit and now - hit[0] < self.ttl:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(hit[1])
+            self._mem.pop(key, None)
+        fp = self._file(key)
+        try:
+            with open(fp, 'r', encoding='utf-8') as f:
+                rec = json.load(f)
+            if now - rec['ts'] >= self.ttl:
+                raise ValueError('expired')
+            os.utime(fp)
+        except Exception:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._remember(key, rec['ts'], rec['info'])
+        return copy.deepcopy(rec['info'])
+
+    def put(self, key: str, info: dict[str, Any]) -> None:
+        info = _clean(info)
+        ts = time.time()
+        with self._lock:
+            self._remember(key, ts, info)
+        try:
+            tmp = self._file(key) + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'ts': ts, 'url': key, 'info': info}, f)
+            os.replace(tmp, self._file(key))
+            self._trim()
+        except Exception:
+            pass
+
+    def _remember(self, key: str, ts: float, info: dict[str, Any]) -> None:
+        self._mem[key] = (ts, info)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.size:
+            self._mem.popitem(last=False)
+
+    def _trim(self) -> None:
+        files = [e for e in os.scandir(self.path) if e.name.endswith('.json')]
+        if len(files) <= self.size:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime)
+        for e in files[:len(files) - self.size]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._mem),
+                'ratio': self.hits / total if total else 0.0}
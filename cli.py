@@ -0,0 +1,90 @@
+import sys
+import argparse
+import threading
+from typing import TextIO
+from engine import Job, make_engine, platform_of
+from settings import load
+
+# ─── Headless batch mode ───
+QUALITIES = {'MP3': ['128', '192', '256', '320', 'FLAC'], 'MP4': ['360p', '480p', '720p', '1080p']}
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog='main.py', description='EasyDownload headless mode')
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument('--batch', metavar='FILE',
+                      help="file with one URL per line ('-' for stdin)")
+    mode.add_argument('--serve', action='store_true',
+                      help='run the local HTTP job daemon (see daemon.py)')
+    p.add_argument('--port', type=int, default=8787, help='daemon port on 127.0.0.1')
+    p.add_argument('-f', '--format', choices=list(QUALITIES), default='MP4')
+    p.add_argument('-q', '--quality', help='128/192/256/320/FLAC or 360p/480p/720p/1080p')
+    p.add_argument('-o', '--out', default='', help='download folder')
+    p.add_argument('-p', '--platform', help='force platform (default: from the URL)')
+    p.add_argument('--playlist', action='store_true', help='download whole playlists')
+    p.add_argument('-w', '--workers', type=int, help='parallel downloads')
+    p.add_argument('--resume', action='store_true',
+                   help='also rerun jobs left unfinished by an earlier session')
+    p.add_argument('--import-dir', metavar='DIR',
+                   help='record media already in DIR in the archive first '
+                        '(yt-dlp .info.json files or names with [id])')
+    return p
+
+
+def _urls(src: TextIO) -> list[str]:
+    return [ln.strip() for ln in src if ln.strip() and not ln.lstrip().startswith('#')]
+
+
+def _ffmpeg() -> None:
+    import provision
+    try:
+        if provision.ready() or provision.ensure():
+            return
+    except Exception as e:
+        print(f'ffmpeg setup failed: {e}', file=sys.stderr)
+    print('warning: ffmpeg not found; merging and conversion will fail', file=sys.stderr)
+
+
+def run(argv: list[str]) -> int:
+    args = _parser().parse_args(argv)
+    if not (args.batch or args.serve or args.resume):
+        _parser().error('one of --batch, --serve or --resume is required')
+    # Every argument is checked before _ffmpeg(), which may download.
+    qual = args.quality or QUALITIES[args.format][-2 if args.format == 'MP3' else -1]
+    if qual not in QUALITIES[args.format]:
+        _parser().error(f'quality {qual!r} is not valid for {args.format}')
+    if args.serve:
+        _ffmpeg()
+        from daemon import serve
+        serve(args.port)
+        return 0
+    if not args.batch:
+        urls = []
+    elif args.batch == '-':
+        urls = _urls(sys.stdin)
+    else:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            urls = _urls(f)
+    _ffmpeg()
+
+    s = load()
+    if args.workers:
+        s = {**s, 'workers': args.workers}  # this run only, never saved
+    lock = threading.Lock()
+
+    def report(job: Job) -> None:
+        if job.parent is None and job.state not in ('queued', 'running'):
+            with lock:
+                line = f'{job.state:8} {job.url}'
+                print(line + (f'\n         {job.error.strip()}' if job.error else ''), flush=True)
+
+    engine = make_engine(s, report)
+    if args.import_dir and engine.archive is not None:
+        n = engine.archive.import_dir(args.import_dir, args.format, qual)
+        print(f'imported {n} archive entries', flush=True)
+    jobs = engine.resume() if args.resume else []
+    jobs += [engine.submit(Job(u, args.platform or platform_of(u), args.format, qual,
+                              args.out, args.playlist)) for u in urls]
+    engine.wait()
+    engine.close()
+    return 1 if any(j.state == 'failed' for j in jobs) else 0
@@ -0,0 +1,149 @@
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+from cli import QUALITIES
+from engine import Engine, Job, make_engine, platform_of
+from settings import load
+
+# ─── Local job daemon ───
+_KEEP = 1000
+_LOCAL = ('127.0.0.1', 'localhost', '::1')
+
+
+class _Registry:
+    """Every submitted job by id; the oldest finished ones are dropped past `_KEEP`."""
+
+    def __init__(self) -> None:
+        self._jobs: OrderedDict[int, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            for jid in [k for k, j in self._jobs.items() if j.state not in ('queued', 'running')]:
+                if len(self._jobs) <= _KEEP:
+                    break
+                del self._jobs[jid]
+
+    def get(self, jid: int) -> Job | None:
+        return self._jobs.get(jid)
+
+    def all(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+
+def _handler(engine: Engine, reg: _Registry) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, code: int, body: Any,
+                  ctype: str = 'application/json') -> None:
+            data = (body if isinstance(body, str) else json.dumps(body)).encode()
+            self.send_response(code)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _foreign(self) -> bool:
+            """Refuse other sites' pages (Origin) and DNS-rebound names (Host)."""
+            origin = self.headers.get('Origin')
+            if origin and urlsplit(origin).hostname not in _LOCAL:
+                return True
+            return urlsplit('//' + self.headers.get('Host', '')).hostname not in _LOCAL
+
+        def do_GET(self) -> None:
+            if self._foreign():
+                self._send(403, {'error': 'forbidden'})
+                return
+            path = self.path.rstrip('/')
+            if path == '/jobs':
+                self._send(200, [j.as_dict() for j in reg.all()])
+            elif path.startswith('/jobs/') and path[6:].isdigit():
+                job = reg.get(int(path[6:]))
+                if job:
+                    self._send(200, job.as_dict())
+                else:
+                    self._send(404, {'error': 'no such job'})
+            elif path == '/stats':
+                self._send(200, {**engine.meter.snapshot(), 'active': len(engine.active()),
+                                 'workers': engine.workers,
+                                 'ydl': {'created': engine.ydls.created,
+                                         'reused': engine.ydls.reused},
+                                 'cache': engine.cache.stats() if engine.cache else None,
+                                 'scheduler': engine.sched.stats()})
+            elif path == '/metrics' and engine.metrics is not None:
+                self._send(200, engine.metrics.prometheus(), 'text/plain; version=0.0.4')
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self) -> None:
+            if self._foreign():
+                self._send(403, {'error': 'forbidden'})
+                return
+            if self.path.rstrip('/') != '/jobs':
+                self._send(404, {'error': 'not found'})
+                return
+            # Browsers only send application/json cross-site after a CORS
+            # preflight, which this server never answers.
+            if self.headers.get_content_type() != 'application/json':
+                self._send(415, {'error': 'Content-Type must be application/json'})
+                return
+            try:
+                n = int(self.headers.get('Content-Length') or 0)
+                req = json.loads(self.rfile.read(n) or b'{}')
+                if not isinstance(req, dict):
+                    raise ValueError('body must be a JSON object')
+                urls = req['urls'] if 'urls' in req else [req['url']]
+                if not isinstance(urls, list) or not urls \
+                        or not all(isinstance(u, str) and u.strip() for u in urls):
+                    raise ValueError('urls must be a non-empty list of strings')
+                fmt = req.get('format', 'MP4')
+                if fmt not in QUALITIES:
+                    raise ValueError(f'format must be one of {list(QUALITIES)}')
+                qual = req.get('quality') or ('320' if fmt == 'MP3' else '1080p')
+                if qual not in QUALITIES[fmt]:
+                    raise ValueError(f'quality for {fmt} must be one of {QUALITIES[fmt]}')
+                for k in ('out', 'platform'):
+                    if not isinstance(req.get(k) or '', str):
+                        raise ValueError(f'{k} must be a string')
+                jobs = [Job(u, req.get('platform') or platform_of(u), fmt, qual,
+                            req.get('out', ''), bool(req.get('playlist'))) for u in urls]
+            except (KeyError, TypeError, ValueError) as e:
+                self._send(400, {'error': f'bad request: {e}'})
+                return
+            for job in jobs:
+                reg.add(job)
+                engine.submit(job)
+            self._send(202, {'ids': [j.id for j in jobs]})
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def serve(port: int = 8787, host: str = '127.0.0.1') -> None:
+    """Run one warm engine behind a small JSON API until interrupted.
+
+    POST /jobs {"url" | "urls", "format", "quality", "out", "platform", "playlist"}
+    GET  /jobs, /jobs/<id>, /stats, /metrics (Prometheus text)
+    POST bodies must be application/json, and requests carrying a foreign
+    Origin or Host are refused, so web pages cannot drive the daemon.
+    """
+    engine = make_engine(load())
+    reg = _Registry()
+    for job in engine.resume():
+        reg.add(job)
+    srv = ThreadingHTTPServer((host, port), _handler(engine, reg))
+    print(f'EasyDownload daemon on http://{host}:{srv.server_address[1]}', flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
@@ -0,0 +1,744 @@
+import os
+import re
+import sys
+import copy
+import json
+import time
+import uuid
+import contextlib
+import queue
+import itertools
+import threading
+import traceback
+import subprocess
+from collections import OrderedDict, deque
+from typing import Any, Callable, Iterator
+from urllib.parse import urlsplit
+from archive import Archive, Key, ident, info_key, info_path
+from cache import InfoCache
+from progress import Progress
+from scheduler import Scheduler
+from segmented import fetch
+from spotify import SpotifyWorker
+from tuner import Tuner
+from journal import Journal
+from metrics import Metrics, Spans
+from store import Store
+from staging import BUF, check_space, cleanup, estimate, paths
+from pipeline import Transcoder, needs_transcode, stream_encode, transcode
+
+# ─── Mix URL helpers ───
+_MIX_RE = re.compile(r'[?&]list=(RD[A-Za-z0-9_-]+)')
+
+
+def _is_mix(url: str) -> bool:
+    return bool(_MIX_RE.search(url))
+
+
+def _strip_mix(url: str) -> str:
+    cleaned = re.sub(r'[&?](list|index|start_radio)=[^&]*', '', url)
+    if '?' not in cleaned and '&' in cleaned:
+        cleaned = cleaned.replace('&', '?', 1)
+    return cleaned
+
+
+# ─── Platforms ───
+_HOSTS = {
+    'spotify.com': 'Spotify', 'instagram.com': 'Instagram', 'tiktok.com': 'TikTok',
+    'pinterest.': 'Pinterest', 'pin.it': 'Pinterest',
+}
+
+
+def platform_of(url: str) -> str:
+    host = urlsplit(url).netloc.lower()
+    for part, name in _HOSTS.items():
+        if part in host:
+            return name
+    return 'YouTube'
+
+
+# ─── Options ───
+# MoveFilesAfterDownloadPP.pp_key(): the class-name default, or 'MoveFiles' where overridden.
+_MOVE_KEYS = ('MoveFilesAfterDownload', 'MoveFiles')
+_KEEP_FAILED = 1000
+_DEF_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Downloads')
+
+
+def audio_target(fmt: str, qual: str) -> tuple[str, str] | None:
+    if fmt != 'MP3':
+        return None
+    return ('flac', '0') if qual == 'FLAC' else ('mp3', qual)
+
+
+def build_opts(fmt: str, qual: str, out: str, playlist: bool = False) -> dict[str, Any]:
+    opts: dict[str, Any] = {
+        'outtmpl': '%(title)s.%(ext)s',
+        'paths': paths(out),
+        'buffersize': BUF,
+        'noplaylist': not playlist,
+    }
+    audio = audio_target(fmt, qual)
+    if audio:
+        # Prefer a stream already in the target codec so it can be copied.
+        codec, aq = audio
+        pick = f'[abr>={int(aq) * 0.9:g}]' if codec == 'mp3' else ''
+        opts['format'] = f'bestaudio[acodec={codec}]{pick}/bestaudio/best'
+        opts['postprocessors'] = [{'key': 'FFmpegExtractAudio',
+                                   'preferredcodec': codec,
+                                   'preferredquality': aq}]
+    else:
+        # H.264 + AAC merge into MP4 with a plain stream copy.
+        q = qual.replace('p', '')
+        opts['format'] = (f'bestvideo[height<={q}][vcodec^=avc1]+bestaudio[acodec^=mp4a]/'
+                          f'best[height<={q}][vcodec^=avc1]/'
+                          f'bestvideo[height<={q}]+bestaudio/best[height<={q}]/best')
+        opts['merge_output_format'] = 'mp4'
+    return opts
+
+
+def _iter_entries(entries: Any) -> Any:
+    """Yield playlist entries page by page without materialising the list."""
+    if hasattr(entries, 'getslice'):
+        size = getattr(entries, '_pagesize', 0) or 50
+        # PagedList keeps every fetched page by default; we walk forward once.
+        entries._use_cache = False
+        start = 0
+        while True:
+            page = entries.getslice(start, start + size)
+            getattr(entries, '_cache', {}).clear()
+            yield from page
+            if len(page) < size:
+                return
+            start += size
+    else:
+        yield from entries or ()
+
+
+def _direct(ydl: Any, info: dict[str, Any]) -> dict[str, Any] | None:
+    """The selected format if it is one plain HTTP(S) file, else None."""
+    sel = ydl.process_ie_result(copy.deepcopy(info), download=False)
+    if sel.get('_type', 'video') != 'video' or sel.get('requested_formats') \
+            or sel.get('protocol') not in ('http', 'https') or not sel.get('url'):
+        return None
+    return sel
+
+
+# ─── Warm YoutubeDL pool ───
+class YdlPool:
+    """Idle YoutubeDL instances per option set, so extractors and HTTP
+    connections stay initialised between jobs. Progress goes to `hook`,
+    postprocessor events to `pp_hook`, every retry calls `retry`, and
+    `check` sees each video once its formats are chosen."""
+
+    def __init__(self, hook: Callable[[dict], None],
+                 pp_hook: Callable[[dict], None] | None = None,
+                 retry: Callable[..., float] | None = None,
+                 check: Callable[..., str | None] | None = None,
+                 per_key: int = 4, keys: int = 16) -> None:
+        self._params: dict[str, Any] = {'progress_hooks': [hook]}
+        if pp_hook:
+            self._params['postprocessor_hooks'] = [pp_hook]
+        if retry:
+            self._params['retry_sleep_functions'] = dict.fromkeys(
+                ('http', 'fragment', 'extractor'), retry)
+        if check:
+            self._params['match_filter'] = check
+        self._per_key = per_key
+        self._keys = keys
+        self._idle: OrderedDict[str, list[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @contextlib.contextmanager
+    def get(self, opts: dict[str, Any]) -> Iterator[Any]:
+        key = json.dumps(opts, sort_keys=True, default=str)
+        with self._lock:
+            stack = self._idle.get(key)
+            ydl = stack.pop() if stack else None
+            if ydl is not None:
+                self.reused += 1
+        if ydl is None:
+            import yt_dlp
+            ydl = yt_dlp.YoutubeDL({**opts, **self._params})
+            self.created += 1
+        try:
+            yield ydl
+        finally:
+            self._put(key, ydl)
+
+    def _put(self, key: str, ydl: Any) -> None:
+        drop = []
+        with self._lock:
+            stack = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(stack) < self._per_key:
+                stack.append(ydl)
+            else:
+                drop.append(ydl)
+            while len(self._idle) > self._keys:
+                drop.extend(self._idle.popitem(last=False)[1])
+        for d in drop:
+            d.close()
+
+
+# ─── Jobs ───
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, url: str, platform: str, fmt: str, qual: str,
+                 out: str = '', playlist: bool = False, parent: 'Job | None' = None,
+                 index: int = 0) -> None:
+        self.id = next(Job._ids)
+        self.uid = uuid.uuid4().hex
+        self.mix = _is_mix(url)
+        self.url = _strip_mix(url) if self.mix else url
+        self.platform = platform
+        self.fmt = fmt
+        self.qual = qual
+        self.out = out or _DEF_OUT
+        self.playlist = playlist and not self.mix
+        self.parent = parent
+        self.index = index  # 1-based position in the parent playlist
+        self.listing: dict[str, Any] = {}  # playlist parents: id and title for entries
+        # Playlist parents only keep their in-flight entries, so memory stays
+        # bounded by the look-ahead window rather than the list length.
+        self.children: dict[int, Job] = {}
+        self.seen = 0
+        self.finished = 0
+        self.expanding = False
+        self.window: threading.Semaphore | None = None
+        self.key: tuple[str, str, str, str] | None = None
+        self.parts: set[str] = set()
+        self.logged = 'queued'
+        self.cached = False
+        self.linked = False
+        self.transcoded: bool | None = None
+        self.spans = Spans('queue')
+        self.bytes = 0
+        self.retries = 0
+        self.state = 'queued'
+        self.progress = 0.0
+        self.error = ''
+
+    def opts(self) -> dict[str, Any]:
+        return build_opts(self.fmt, self.qual, self.out, self.playlist)
+
+    @property
+    def root(self) -> 'Job':
+        return self.parent.root if self.parent is not None else self
+
+    def entry_fields(self) -> dict[str, Any]:
+        """The playlist_* fields yt-dlp sets when it expands a playlist itself,
+        so output templates using them work for entries queued one by one."""
+        if self.parent is None or not self.index:
+            return {}
+        pl = self.parent.listing
+        return {'playlist_index': self.index, 'playlist_autonumber': self.index,
+                'playlist': pl.get('title') or pl.get('id'), 'playlist_id': pl.get('id'),
+                'playlist_title': pl.get('title'), 'playlist_uploader': pl.get('uploader')}
+
+    def spec(self) -> dict[str, Any]:
+        return {'url': self.url, 'platform': self.platform, 'format': self.fmt,
+                'quality': self.qual, 'out': self.out, 'playlist': self.playlist}
+
+    @classmethod
+    def from_spec(cls, spec: dict[str, Any]) -> 'Job':
+        return cls(spec['url'], spec['platform'], spec['format'], spec['quality'],
+                   spec.get('out', ''), spec.get('playlist', False))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'id': self.id, 'url': self.url, 'platform': self.platform,
+                'format': self.fmt, 'quality': self.qual, 'out': self.out,
+                'playlist': self.playlist, 'index': self.index, 'state': self.state,
+                'progress': round(self.progress, 4), 'error': self.error.strip(),
+                'entries': self.seen, 'finished': self.finished,
+                'cached': self.cached, 'linked': self.linked,
+                'transcoded': self.transcoded}
+
+
+class Engine:
+    """Bounded worker pool; `on_event` is called from worker threads."""
+
+    def __init__(self, workers: int = 3,
+                 on_event: Callable[[Job], None] | None = None,
+                 archive: Archive | None = None,
+                 cache: InfoCache | None = None,
+                 transcoder: Transcoder | None = None,
+                 stream_audio: bool = False,
+                 progress: Progress | None = None,
+                 segments: int = 1,
+                 scheduler: Scheduler | None = None,
+                 journal: Journal | None = None,
+                 metrics: Metrics | None = None,
+                 store: Store | None = None) -> None:
+        self.workers = self.base_workers = max(1, int(workers))
+        self.sched = scheduler or Scheduler()
+        self.tuner: Tuner | None = None
+        self.journal = journal
+        self.metrics = metrics
+        self.store = store
+        self.segments = max(1, int(segments))
+        self.spotify = SpotifyWorker()
+        self.meter = progress or Progress()
+        self.archive = archive
+        self.cache = cache
+        self.transcoder = transcoder
+        self.stream_audio = stream_audio
+        # Unfinished top-level jobs; finished ones move into the batch counters
+        # (and `failed`) on the next `active()`, so a long-running daemon
+        # never rescans its history.
+        self.jobs: dict[int, Job] = {}
+        self.failed: deque[Job] = deque(maxlen=_KEEP_FAILED)
+        self._done = 0
+        self._total = 0
+        self._local = threading.local()
+        self.ydls = YdlPool(self._dispatch, self._pp_dispatch, self._retried, self._check)
+        self._q: queue.Queue[Job] = queue.Queue()
+        self._on = on_event or (lambda j: None)
+        self._lock = threading.Lock()
+        self._alive = 0
+        self.resize(self.workers)
+
+    def resize(self, n: int) -> None:
+        """Grow the pool now; surplus workers exit after their current job."""
+        with self._lock:
+            self.workers = max(1, int(n))
+            extra = self.workers - self._alive
+            self._alive += max(extra, 0)
+        for _ in range(extra):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def requeue(self, job: Job) -> None:
+        self._q.put(job)
+
+    def resume(self) -> list[Job]:
+        """Requeue jobs the journal saw queued or running when the last session ended."""
+        if self.journal is None:
+            return []
+        jobs = []
+        for rec in self.journal.pending():
+            job = Job.from_spec(rec['job'])
+            job.uid = rec['uid']
+            job.parts.update(rec['parts'])
+            jobs.append(self.submit(job, journal=False))
+        return jobs
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+    def _notify(self, job: Job) -> None:
+        if self.journal is not None and job.parent is None and job.state != job.logged:
+            job.logged = job.state
+            self.journal.log(job.state, job.uid, error=job.error.strip())
+        self._on(job)
+
+    def submit(self, job: Job, journal: bool = True) -> Job:
+        if job.parent is None:
+            with self._lock:
+                self._prune()
+                if not self.jobs:
+                    self._done = self._total = 0
+                    self.failed.clear()
+                self.jobs[job.id] = job
+                self._total += 1
+            if self.journal is not None and journal:
+                self.journal.log('queued', job.uid, job=job.spec())
+        self._q.put(job)
+        self._notify(job)
+        return job
+
+    def _key(self, job: Job) -> Key | None:
+        if job.key is None and job.platform != 'Spotify':
+            try:
+                found = ident(job.url)
+            except Exception:
+                return None
+            job.key = found and (*found, job.fmt, job.qual)
+        return job.key
+
+    def _known(self, job: Job) -> bool:
+        if self.archive is None or job.platform == 'Spotify':
+            return False
+        return self.archive.has(self._key(job), job.out)
+
+    def _stored(self, job: Job) -> bool:
+        return self.store is not None and job.platform != 'Spotify' \
+            and self.store.lookup(self._key(job)) is not None
+
+    def _prune(self) -> None:
+        # Caller holds _lock.
+        for jid in [i for i, j in self.jobs.items() if j.state not in ('queued', 'running')]:
+            job = self.jobs.pop(jid)
+            self._done += 1
+            if job.state == 'failed':
+                self.failed.append(job)
+
+    def active(self) -> list[Job]:
+        with self._lock:
+            self._prune()
+            return list(self.jobs.values())
+
+    def batch(self) -> tuple[int, int]:
+        """(finished, submitted) top-level jobs since the engine was last idle."""
+        with self._lock:
+            self._prune()
+            return self._done, self._total
+
+    def progress(self) -> float:
+        with self._lock:
+            self._prune()
+            jobs, done, total = list(self.jobs.values()), self._done, self._total
+        for j in jobs:
+            if j.state == 'running' and j.playlist:
+                self._rollup(j)
+        return (done + sum(j.progress for j in jobs)) / total if total else 0.0
+
+    def wait(self) -> None:
+        # Playlist expansion runs outside the queue, so idle means no active jobs.
+        while True:
+            self._q.join()
+            if not self.active():
+                return
+            time.sleep(0.1)
+
+    def _work(self) -> None:
+        while True:
+            job = self._q.get()
+            try:
+                if job.playlist or self._stored(job) or self._known(job):
+                    # Expansion, store links and archive skips make no media requests.
+                    self._run(job)
+                elif self.sched.acquire(job):
+                    try:
+                        self._run(job)
+                    finally:
+                        parked = self.sched.release(job.platform)
+                        if parked is not None:
+                            self._q.put(parked)
+            except Exception as e:
+                self._abort(job, e)
+            finally:
+                self._q.task_done()
+            with self._lock:
+                if self._alive > self.workers:
+                    self._alive -= 1
+                    return
+
+    def _abort(self, job: Job, err: Exception) -> None:
+        """`_run` raised outside its own handler (an event callback, say).
+
+        A job still marked active fails with the error and is finished, so
+        `wait()` returns; otherwise the error is only reported. Either way
+        the worker thread carries on.
+        """
+        if job.state not in ('queued', 'running'):
+            traceback.print_exception(err)
+            return
+        job.error = job.error or f'{type(err).__name__}: {err}'
+        job.state = 'failed'
+        try:
+            self._finish(job)
+        except Exception as e:
+            traceback.print_exception(e)
+
+    def _run(self, job: Job) -> None:
+        job.state = 'running'
+        job.spans.stop('queue')
+        self._notify(job)
+        try:
+            os.makedirs(job.out, exist_ok=True)
+            if job.platform == 'Spotify':
+                self._spotdl(job)
+            elif job.playlist:
+                job.expanding = True
+                job.window = threading.Semaphore(2 * self.workers)
+                threading.Thread(target=self._expand, args=(job,), daemon=True).start()
+                return
+            elif self.store is not None and self.store.materialize(self._key(job), job.out):
+                job.linked = True
+                job.progress = 1.0
+                job.state = 'done'
+                self._finish(job)
+                return
+            elif self._known(job):
+                job.progress = 1.0
+                job.state = 'skipped'
+                self._finish(job)
+                return
+            else:
+                opts = job.opts()
+                rate = self.sched.rate(job.platform)
+                if rate:
+                    # Space out yt-dlp's own extractor requests too.
+                    opts['sleep_interval_requests'] = 1 / rate
+                audio = audio_target(job.fmt, job.qual)
+                if audio and self.transcoder:
+                    opts.pop('postprocessors', None)
+                self._local.job = job
+                with self.ydls.get(opts) as ydl:
+                    with job.spans('resolve'):
+                        info = {**self._resolve(ydl, job), **job.entry_fields()}
+                    stream = bool(audio) and self.stream_audio
+                    split = self._segs(job) > 1 and (not audio or self.transcoder is not None)
+                    sel = _direct(ydl, info) if stream or split else None
+                    if sel:
+                        check_space(job.out, estimate(sel, bool(audio)))
+                    if sel and stream:
+                        self._stream(ydl, job, sel, audio)
+                        return
+                    info = (sel and split and self._segmented(ydl, job, sel)) \
+                        or ydl.process_ie_result(info, download=True)
+                job.transcoded = bool(audio) and needs_transcode(info, *audio)
+                if audio and self.transcoder and job.transcoded:
+                    # Hand the raw file to the encoder pool; this worker is free
+                    # for the next download once a backlog slot is available.
+                    job.progress = 0.99
+                    job.spans.start('postprocess')
+                    self.transcoder.submit(info_path(info), *audio,
+                                           lambda p, err: self._encoded(job, info, p, err))
+                    return
+                path = info_path(info)
+                if audio and self.transcoder:
+                    with job.spans('postprocess'):
+                        path = transcode(path, *audio, copy=True)
+                self._record(job, info, path)
+            job.progress = 1.0
+            job.state = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.state = 'failed'
+        self._finish(job)
+
+    def _spotdl(self, job: Job) -> None:
+        def hook(i: int, n: int, name: str) -> None:
+            job.progress = min(i / n, 0.99)
+        try:
+            self.spotify.download([job.url], job.out, hook)
+        except ImportError:
+            # spotdl only available as a separate install: fall back to its CLI.
+            subprocess.run(
+                [sys.executable, '-m', 'spotdl', 'download', job.url, '--output', job.out],
+                check=True)
+
+    def _bytes_hook(self, job: Job, name: str, tmp: str = '') -> Callable[[int, int], None]:
+        return lambda done, total: self._hook(job, {
+            'status': 'downloading', 'filename': name, 'tmpfilename': tmp,
+            'downloaded_bytes': done, 'total_bytes': total})
+
+    def _stream(self, ydl: Any, job: Job, sel: dict[str, Any], audio: tuple[str, str]) -> None:
+        """Encode a plain-HTTP audio format while it downloads."""
+        base = os.path.splitext(ydl.prepare_filename(sel))[0]
+        job.transcoded = needs_transcode(sel, *audio)
+        with job.spans('download'):
+            path = stream_encode(sel['url'], sel.get('http_headers') or {}, base, *audio,
+                                 hook=self._bytes_hook(job, base), copy=not job.transcoded)
+        self._record(job, sel, path)
+        job.progress = 1.0
+        job.state = 'done'
+        self._finish(job)
+
+    def _segs(self, job: Job) -> int:
+        return self.tuner.segments(job.platform) if self.tuner else self.segments
+
+    def _segmented(self, ydl: Any, job: Job, sel: dict[str, Any]) -> dict[str, Any] | None:
+        """Fetch a single-file format over several ranged connections."""
+        path = ydl.prepare_filename(sel)
+        # Extra connections count against the platform cap like jobs do.
+        extra = self.sched.borrow(job.platform, self._segs(job) - 1)
+        try:
+            with job.spans('download'):
+                if not os.path.exists(path) and not fetch(
+                        sel['url'], path, sel.get('http_headers') or {}, 1 + extra,
+                        hook=self._bytes_hook(job, path, path + '.part'),
+                        retry=lambda: self._retried(job=job),
+                        pace=lambda: self.sched.request(job.platform)):
+                    return None
+        finally:
+            for parked in self.sched.give_back(job.platform, extra):
+                self._q.put(parked)
+        sel['filepath'] = path
+        return sel
+
+    def _record(self, job: Job, info: dict[str, Any], path: str) -> None:
+        key = (info and info_key(info, job.fmt, job.qual)) or job.key
+        if self.store is not None:
+            with job.spans('move'):
+                path = self.store.ingest(key, path)
+        if self.archive is not None and info:
+            self.archive.add(key, path)
+
+    def _encoded(self, job: Job, info: dict[str, Any], path: str,
+                 err: Exception | None) -> None:
+        # Runs as a Future callback: anything raised here would be dropped
+        # and the job never finished, so failures become the job's error.
+        job.spans.stop('postprocess')
+        try:
+            if err is not None:
+                raise err
+            self._record(job, info, path)
+            job.progress = 1.0
+            job.state = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.state = 'failed'
+        self._finish(job)
+
+    def _resolve(self, ydl: Any, job: Job) -> dict[str, Any]:
+        """Raw extractor result for `job`, reused across formats via the cache."""
+        key = _strip_mix(job.url)
+        if self.cache is not None:
+            info = self.cache.get(key)
+            if info is not None:
+                job.cached = True
+                return info
+        info = ydl.extract_info(job.url, download=False, process=False)
+        if self.cache is not None and info.get('_type', 'video') == 'video':
+            self.cache.put(key, info)
+        return info
+
+    def _finish(self, job: Job) -> None:
+        self.meter.finish(job.id)
+        if job.parent is None and not any(j.out == job.out for j in self.active()):
+            cleanup(job.out)
+        if self.metrics is not None:
+            try:
+                self.metrics.record(job)
+            except Exception:
+                pass  # a failed metrics write must not lose the job's result
+        # Settle the parent before any callback runs, so a raising callback
+        # cannot leave a playlist running forever.
+        parent = job.parent
+        if parent is not None:
+            with self._lock:
+                parent.children.pop(job.id, None)
+                parent.finished += 1
+                if job.state == 'failed':
+                    parent.error += f'{job.url}: {job.error}\n'
+                self._rollup(parent)
+                last = not parent.expanding and not parent.children
+                if last:
+                    parent.state = 'failed' if parent.error else 'done'
+            if parent.window is not None:
+                parent.window.release()
+        self._notify(job)
+        if parent is not None:
+            self._notify(parent)
+
+    def _rollup(self, parent: Job) -> None:
+        running = sum(k.progress for k in list(parent.children.values()))
+        p = (parent.finished + running) / max(parent.seen, 1)
+        parent.progress = min(p, 0.99) if parent.expanding else p
+
+    def _expand(self, job: Job) -> None:
+        """Resolve playlist pages lazily, queueing each entry as it arrives."""
+        try:
+            with self.ydls.get({'quiet': True, 'noplaylist': False}) as ydl:
+                info = ydl.extract_info(job.url, download=False, process=False)
+                while info and info.get('_type') in ('url', 'url_transparent'):
+                    info = ydl.extract_info(info['url'], download=False, process=False,
+                                            ie_key=info.get('ie_key'))
+                if not info or info.get('_type') != 'playlist':
+                    job.playlist = job.expanding = False
+                    self._q.put(job)
+                    return
+                job.listing = {k: info.get(k) for k in ('id', 'title', 'uploader')}
+                for i, e in enumerate(_iter_entries(info.get('entries')), 1):
+                    url = e and (e.get('url') or e.get('webpage_url'))
+                    if not url:
+                        continue
+                    key = info_key(e, job.fmt, job.qual)
+                    if self.archive is not None and self.archive.has(key, job.out) \
+                            and (self.store is None or self.store.lookup(key) is None):
+                        with self._lock:
+                            job.seen += 1
+                            job.finished += 1
+                        continue
+                    job.window.acquire()
+                    kid = Job(url, job.platform, job.fmt, job.qual, job.out,
+                              parent=job, index=i)
+                    kid.key = key
+                    with self._lock:
+                        job.seen += 1
+                        job.children[kid.id] = kid
+                    self.submit(kid)
+        except Exception as e:
+            job.error += f'{job.url}: {e}\n'
+        with self._lock:
+            job.expanding = False
+            self._rollup(job)
+            if not job.children:
+                job.state = 'failed' if job.error or not job.seen else 'done'
+        self._notify(job)
+
+    def _dispatch(self, d: dict) -> None:
+        # Pooled YoutubeDL instances are shared, so route by the calling thread.
+        job = getattr(self._local, 'job', None)
+        if job is not None:
+            self._hook(job, d)
+
+    def _pp_dispatch(self, d: dict) -> None:
+        job = getattr(self._local, 'job', None)
+        if job is not None and d.get('status') in ('started', 'finished'):
+            name = d.get('postprocessor', '')
+            phase = ('merge' if name == 'Merger' else 'move' if name in _MOVE_KEYS
+                     else 'postprocess')
+            (job.spans.start if d['status'] == 'started' else job.spans.stop)(phase)
+
+    def _retried(self, n: int = 0, job: Job | None = None) -> float:
+        # Used as yt-dlp's retry sleep function: count the retry, don't sleep.
+        job = job or getattr(self._local, 'job', None)
+        if job is not None:
+            job.retries += 1
+        return 0
+
+    def _check(self, info: dict, incomplete: bool = False) -> str | None:
+        # yt-dlp match_filter: runs after format selection, before any bytes move.
+        job = getattr(self._local, 'job', None)
+        if job is not None and not incomplete:
+            check_space(job.out, estimate(info, audio_target(job.fmt, job.qual) is not None))
+        return None
+
+    def _hook(self, job: Job, d: dict) -> None:
+        # Called per chunk: only record numbers, readers poll `meter`/`progress()`.
+        if d.get('status') == 'downloading':
+            total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+            done = d.get('downloaded_bytes', 0)
+            tmp = d.get('tmpfilename')
+            if tmp and self.journal is not None and tmp not in job.parts:
+                job.parts.add(tmp)
+                self.journal.log('part', job.root.uid, path=tmp)
+            job.spans.start('download')
+            moved = self.meter.update(job.id, d.get('filename', ''), done, total)
+            if moved > 0:
+                job.bytes += moved
+            self.sched.consume(moved)
+            if self.tuner:
+                self.tuner.add(job.platform, moved)
+            if total > 0:
+                job.progress = min(done / total, 0.99)
+        elif d.get('status') == 'finished':
+            job.spans.stop('download')
+            job.progress = 0.99
+
+
+def make_engine(s: dict, on_event: Callable[[Job], None] | None = None) -> Engine:
+    """Engine configured from settings.json keys, shared by the GUI and CLI."""
+    from settings import update
+    engine = Engine(s.get('workers', 3), on_event,
+                    Archive() if s.get('archive', True) else None,
+                    InfoCache(ttl=s.get('cache_ttl', 1800), size=s.get('cache_size', 256)),
+                    Transcoder(s.get('encoders', 0)),
+                    s.get('stream_audio', False),
+                    segments=s.get('segments', 4),
+                    scheduler=Scheduler(s.get('limits')),
+                    journal=Journal() if s.get('journal', True) else None,
+                    metrics=Metrics(prom=s.get('metrics_prom', ''))
+                    if s.get('metrics', True) else None,
+                    store=Store(s.get('store_dir', '')) if s.get('store', False) else None)
+    if engine.store is not None:
+        threading.Thread(target=engine.store.gc, daemon=True, name='store-gc').start()
+    if s.get('autotune', True):
+        engine.tuner = Tuner(engine, s.get('tune', {}), lambda tune: update(tune=tune))
+    return engine
@@ -0,0 +1,456 @@
+import threading
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+import provision
+from engine import Job, make_engine
+from progress import fmt_eta, fmt_rate
+from settings import load, update
+
+# ─── Translations ───
+_TR = {
+    'title': 'EasyDownload',
+    'platform': 'PLATFORM',
+    'url': 'URL',
+    'mode': 'MOD',
+    'mode_single': 'Tekli',
+    'mode_playlist': 'Playlist',
+    'format': 'FORMAT',
+    'quality_audio': 'SES KALİTESİ',
+    'quality_flac': 'KAYIPSIZ',
+    'quality_video': 'GÖRÜNTÜ KALİTESİ',
+    'download_location': 'İNDİRME KONUMU',
+    'browse': 'Göz At',
+    'download': 'İndir',
+    'ffmpeg_downloading': 'FFmpeg indiriliyor...',
+    'ffmpeg_installed': '✓ Hazır',
+    'ffmpeg_failed': 'FFmpeg indirilemedi.',
+    'download_complete': 'İndirme tamamlandı!',
+    'error': 'Hata',
+    'success': 'Başarılı',
+    'mix_detected': 'Mix algılandı – sadece ilk şarkı.',
+    'downloading': 'İndiriliyor...',
+    'url_placeholder': 'YouTube, Instagram, TikTok linkini yapıştırın...',
+    'dir_placeholder': 'İndirme klasörü...',
+    'guide_title': 'Kılavuz',
+    'guide_text': (
+        'EasyDownload Kılavuz:\n\n'
+        '• FFmpeg yoksa otomatik indirir.\n'
+        '• YouTube Mix → sadece ilk şarkı.\n'
+        '• FLAC = kayıpsız ses.\n'
+        '• Playlist modu ile tüm liste indirilir.'
+    ),
+}
+
+_EN = {
+    'title': 'EasyDownload',
+    'platform': 'PLATFORM',
+    'url': 'URL',
+    'mode': 'MODE',
+    'mode_single': 'Single',
+    'mode_playlist': 'Playlist',
+    'format': 'FORMAT',
+    'quality_audio': 'AUDIO QUALITY',
+    'quality_flac': 'LOSSLESS',
+    'quality_video': 'VIDEO QUALITY',
+    'download_location': 'DOWNLOAD LOCATION',
+    'browse': 'Browse',
+    'download': 'Download',
+    'ffmpeg_downloading': 'Downloading FFmpeg...',
+    'ffmpeg_installed': '✓ Ready',
+    'ffmpeg_failed': 'FFmpeg download failed.',
+    'download_complete': 'Download complete!',
+    'error': 'Error',
+    'success': 'Success',
+    'mix_detected': 'Mix detected – first song only.',
+    'downloading': 'Downloading...',
+    'url_placeholder': 'Paste YouTube, Instagram, TikTok link...',
+    'dir_placeholder': 'Download folder...',
+    'guide_title': 'Guide',
+    'guide_text': (
+        'EasyDownload Guide:\n\n'
+        '• Auto-downloads FFmpeg if missing.\n'
+        '• YouTube Mix → first song only.\n'
+        '• FLAC = lossless audio.\n'
+        '• Playlist mode downloads entire list.'
+    ),
+}
+
+_LANGS = {'tr': _TR, 'en': _EN}
+
+_UI_MS = 100
+
+
+class App(ctk.CTk):
+    # ─── Colors ───
+    D = {
+        'bg': '#0d0b1e', 'card': '#16132e', 'brd': '#252252',
+        'acc': '#7c6fff', 'acc_h': '#9589ff',
+        'txt': '#eeeeff', 'txt2': '#9995cc', 'txt3': '#6662aa',
+        'inp': '#1c1940', 'inp_b': '#2e2a60',
+        'seg': '#1c1940', 'seg_s': '#7c6fff', 'seg_txt': '#ccccff',
+    }
+    L = {
+        'bg': '#f0ecff', 'card': '#ffffff', 'brd': '#d5d0f0',
+        'acc': '#7c6fff', 'acc_h': '#6558e0',
+        'txt': '#1a1835', 'txt2': '#6660aa', 'txt3': '#8880cc',
+        'inp': '#f5f2ff', 'inp_b': '#d5d0f0',
+        'seg': '#e8e4ff', 'seg_s': '#7c6fff', 'seg_txt': '#333355',
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._s = load()
+        self.lang = 'tr'
+        self._thm = self._s.get('theme', 'dark')
+        self._playlist = False
+        # Colour role -> (light, dark): customtkinter re-colours widgets built
+        # with these pairs in place whenever the appearance mode changes.
+        self._pal = {k: (self.L[k], self.D[k]) for k in self.D}
+        # (widget, option, translation key) for everything re-labelled on a language switch.
+        self._texts: list[tuple[ctk.CTkBaseClass, str, str]] = []
+
+        ctk.set_appearance_mode(self._thm)
+        self.title('EasyDownload')
+        self.minsize(520, 800)
+
+        geo = self._s.get('geo')
+        if geo:
+            parts = geo.split('+')[0]
+            self.geometry(parts)
+        else:
+            self.geometry('560x950')
+        self.after(30, self._center)
+
+        self.protocol('WM_DELETE_WINDOW', self._quit)
+        self._engine = make_engine(self._s, self._on_job)
+        self._busy = False
+        self._build()
+        self._busy = bool(self._engine.resume())
+        self.after(_UI_MS, self._tick)
+        threading.Thread(target=self._ffmpeg_check, daemon=True).start()
+
+    @property
+    def t(self) -> dict:
+        return _LANGS[self.lang]
+
+    @property
+    def c(self) -> dict:
+        return self.D if self._thm == 'dark' else self.L
+
+    def _center(self) -> None:
+        self.update_idletasks()
+        w, h = self.winfo_width(), self.winfo_height()
+        self.geometry(f'{w}x{h}+{(self.winfo_screenwidth()-w)//2}+{(self.winfo_screenheight()-h)//2}')
+
+    def _quit(self) -> None:
+        update(geo=self.geometry(), theme=self._thm)
+        self._engine.close()
+        self.destroy()
+
+    # ───────────── BUILD ─────────────
+
+    def _build(self) -> None:
+        c = self._pal
+        self._texts.clear()
+        for w in self.winfo_children():
+            w.destroy()
+
+        self.configure(fg_color=c['bg'])
+
+        wrap = ctk.CTkFrame(self, fg_color='transparent')
+        wrap.pack(fill='both', expand=True, padx=26, pady=(16, 24))
+
+        # ── Header ──
+        hdr = ctk.CTkFrame(wrap, fg_color='transparent')
+        hdr.pack(fill='x', pady=(0, 14))
+
+        lf = ctk.CTkFrame(hdr, fg_color='transparent')
+        lf.pack(side='left')
+        ctk.CTkLabel(lf, text='EasyDownload',
+                     font=ctk.CTkFont('Segoe UI', 26, 'bold'),
+                     text_color=c['txt']).pack(anchor='w')
+        ctk.CTkLabel(lf, text='YouTube • Instagram • TikTok • Pinterest • Spotify',
+                     font=ctk.CTkFont('Segoe UI', 11),
+                     text_color=c['txt3']).pack(anchor='w', pady=(1, 0))
+
+        rf = ctk.CTkFrame(hdr, fg_color='transparent')
+        rf.pack(side='right')
+
+        ctk.CTkButton(rf, text='?', width=32, height=32, corner_radius=16,
+                      fg_color=c['card'], hover_color=c['brd'],
+                      text_color=c['txt'], border_width=1, border_color=c['brd'],
+                      font=ctk.CTkFont(size=14, weight='bold'),
+                      command=self._guide).pack(side='left', padx=3)
+
+        self._thm_btn = ctk.CTkButton(rf, text='☀️' if self._thm == 'dark' else '🌙',
+                                      width=32, height=32, corner_radius=16,
+                                      fg_color=c['card'], hover_color=c['brd'],
+                                      text_color=c['txt'], border_width=1, border_color=c['brd'],
+                                      font=ctk.CTkFont(size=14),
+                                      command=self._flip_theme)
+        self._thm_btn.pack(side='left', padx=3)
+
+        self._lang_seg = ctk.CTkSegmentedButton(
+            rf, values=['TR', 'EN'], width=80, height=30,
+            font=ctk.CTkFont(size=11, weight='bold'),
+            fg_color=c['seg'], selected_color=c['seg_s'],
+            selected_hover_color=c['acc_h'],
+            unselected_color=c['card'], unselected_hover_color=c['brd'],
+            text_color=c['seg_txt'],
+            command=self._lang_changed)
+        self._lang_seg.set('TR' if self.lang == 'tr' else 'EN')
+        self._lang_seg.pack(side='left', padx=(6, 0))
+
+        # ── Card ──
+        card = ctk.CTkFrame(wrap, fg_color=c['card'], corner_radius=18,
+                            border_width=1, border_color=c['brd'])
+        card.pack(fill='x', pady=(0, 16))
+
+        inn = ctk.CTkFrame(card, fg_color='transparent')
+        inn.pack(fill='x', padx=20, pady=16)
+
+        # — Platform —
+        self._section(inn, 'platform')
+        self._plat_seg = ctk.CTkSegmentedButton(
+            inn, values=['YouTube', 'Instagram', 'TikTok', 'Pinterest', 'Spotify'],
+            height=34, font=ctk.CTkFont(size=12, weight='bold'),
+            fg_color=c['seg'], selected_color=c['seg_s'],
+            selected_hover_color=c['acc_h'],
+            unselected_color=c['card'], unselected_hover_color=c['brd'],
+            text_color=c['seg_txt'])
+        self._plat_seg.set('YouTube')
+        self._plat_seg.pack(fill='x', pady=(0, 10))
+
+        # — Mode —
+        self._section(inn, 'mode')
+        self._mode_seg = ctk.CTkSegmentedButton(
+            inn, values=[self.t['mode_single'], self.t['mode_playlist']],
+            height=34, font=ctk.CTkFont(size=12, weight='bold'),
+            fg_color=c['seg'], selected_color=c['seg_s'],
+            selected_hover_color=c['acc_h'],
+            unselected_color=c['card'], unselected_hover_color=c['brd'],
+            text_color=c['seg_txt'])
+        self._mode_seg.set(self.t['mode_single'])
+        self._mode_seg.pack(fill='x', pady=(0, 10))
+
+        self._sep(inn, c)
+
+        # — URL —
+        self._section(inn, 'url')
+        self._url = ctk.CTkEntry(
+            inn, height=40, corner_radius=10,
+            fg_color=c['inp'], border_color=c['inp_b'],
+            text_color=c['txt'], placeholder_text=self.t['url_placeholder'],
+            placeholder_text_color=c['txt3'], font=ctk.CTkFont(size=13))
+        self._url.pack(fill='x', pady=(0, 10))
+        self._texts.append((self._url, 'placeholder_text', 'url_placeholder'))
+
+        self._sep(inn, c)
+
+        # — Format —
+        self._section(inn, 'format')
+        self._fmt_seg = ctk.CTkSegmentedButton(
+            inn, values=['MP3', 'MP4'],
+            height=34, font=ctk.CTkFont(size=13, weight='bold'),
+            fg_color=c['seg'], selected_color=c['seg_s'],
+            selected_hover_color=c['acc_h'],
+            unselected_color=c['card'], unselected_hover_color=c['brd'],
+            text_color=c['seg_txt'],
+            command=self._fmt_changed)
+        self._fmt_seg.set('MP4')
+        self._fmt_seg.pack(fill='x', pady=(0, 10))
+
+        # — Quality —
+        self._lq = self._section(inn, 'quality_video', False)
+        self._qual_seg = ctk.CTkSegmentedButton(
+            inn, values=['360p', '480p', '720p', '1080p'],
+            height=34, font=ctk.CTkFont(size=12, weight='bold'),
+            fg_color=c['seg'], selected_color=c['seg_s'],
+            selected_hover_color=c['acc_h'],
+            unselected_color=c['card'], unselected_hover_color=c['brd'],
+            text_color=c['seg_txt'])
+        self._qual_seg.set('1080p')
+        self._qual_seg.pack(fill='x', pady=(0, 10))
+
+        self._sep(inn, c)
+
+        # — Download location —
+        self._section(inn, 'download_location')
+        dr = ctk.CTkFrame(inn, fg_color='transparent')
+        dr.pack(fill='x')
+
+        self._dir = ctk.CTkEntry(
+            dr, height=38, corner_radius=10,
+            fg_color=c['inp'], border_color=c['inp_b'],
+            text_color=c['txt'], placeholder_text=self.t['dir_placeholder'],
+            placeholder_text_color=c['txt3'], font=ctk.CTkFont(size=13))
+        self._dir.pack(side='left', fill='x', expand=True, padx=(0, 8))
+        self._texts.append((self._dir, 'placeholder_text', 'dir_placeholder'))
+
+        self._browse = ctk.CTkButton(
+            dr, text=self.t['browse'], height=38, width=80, corner_radius=10,
+            fg_color=c['card'], hover_color=c['brd'],
+            text_color=c['txt2'], border_width=1, border_color=c['brd'],
+            font=ctk.CTkFont(size=12), command=self._pick_dir)
+        self._browse.pack(side='right')
+        self._texts.append((self._browse, 'text', 'browse'))
+
+        # ── Progress ──
+        self._prog = ctk.CTkProgressBar(
+            wrap, height=6, corner_radius=3,
+            fg_color=c['inp'], progress_color=c['acc'])
+        self._prog.set(0)
+        self._prog.pack(fill='x', pady=(10, 4))
+
+        # ── Status ──
+        self._status = ctk.CTkLabel(wrap, text='',
+                                     font=ctk.CTkFont(size=11),
+                                     text_color=c['txt3'])
+        self._status.pack(pady=(2, 10))
+
+        # ── Download button ──
+        self._dl_btn = ctk.CTkButton(
+            wrap, text=self.t['download'], height=52, width=240,
+            corner_radius=14, font=ctk.CTkFont('Segoe UI', 15, 'bold'),
+            fg_color=c['acc'], hover_color=c['acc_h'],
+            text_color='#ffffff', command=self._go)
+        self._dl_btn.pack(pady=(0, 8))
+        self._texts.append((self._dl_btn, 'text', 'download'))
+
+    def _section(self, parent: ctk.CTkFrame, key: str, track: bool = True) -> ctk.CTkLabel:
+        lbl = ctk.CTkLabel(parent, text=self.t[key],
+                           font=ctk.CTkFont('Segoe UI', 10, 'bold'),
+                           text_color=self._pal['txt3'])
+        lbl.pack(anchor='w', pady=(8, 5))
+        if track:
+            self._texts.append((lbl, 'text', key))
+        return lbl
+
+    @staticmethod
+    def _sep(parent: ctk.CTkFrame, c: dict) -> None:
+        ctk.CTkFrame(parent, fg_color=c['brd'], height=1, corner_radius=0).pack(fill='x', pady=4)
+
+    # ───────────── ACTIONS ─────────────
+
+    def _pick_dir(self) -> None:
+        d = filedialog.askdirectory()
+        if d:
+            self._dir.delete(0, 'end')
+            self._dir.insert(0, d)
+
+    def _lang_changed(self, val: str) -> None:
+        self.lang = 'tr' if val == 'TR' else 'en'
+        t = self.t
+        for w, opt, key in self._texts:
+            w.configure(**{opt: t[key]})
+        # Update mode segmented button values
+        old_mode = self._mode_seg.get()
+        is_playlist = old_mode in [_TR['mode_playlist'], _EN['mode_playlist']]
+        self._mode_seg.configure(values=[t['mode_single'], t['mode_playlist']])
+        self._mode_seg.set(t['mode_playlist'] if is_playlist else t['mode_single'])
+        self._fmt_changed(self._fmt_seg.get())
+
+    def _fmt_changed(self, val: str) -> None:
+        t = self.t
+        if val == 'MP3':
+            self._lq.configure(text=t['quality_audio'])
+            self._qual_seg.configure(values=['128', '192', '256', '320', 'FLAC'])
+            self._qual_seg.set('320')
+        else:
+            self._lq.configure(text=t['quality_video'])
+            self._qual_seg.configure(values=['360p', '480p', '720p', '1080p'])
+            self._qual_seg.set('1080p')
+
+    def _flip_theme(self) -> None:
+        self._thm = 'light' if self._thm == 'dark' else 'dark'
+        # Widgets hold (light, dark) colour pairs, so this recolours them in
+        # place, one redraw per widget (linear in the widget count, nothing is
+        # rebuilt); entries, selections and the status line are left as they are.
+        ctk.set_appearance_mode(self._thm)
+        self._thm_btn.configure(text='☀️' if self._thm == 'dark' else '🌙')
+
+    def _guide(self) -> None:
+        t = self.t
+        c = self.c
+        w = ctk.CTkToplevel(self)
+        w.title(t['guide_title'])
+        w.geometry('400x260')
+        w.resizable(False, False)
+        w.transient(self)
+        w.grab_set()
+        w.configure(fg_color=c['bg'])
+        ctk.CTkLabel(w, text=f"📖  {t['guide_title']}",
+                     font=ctk.CTkFont(size=18, weight='bold'),
+                     text_color=c['txt']).pack(pady=(20, 8))
+        ctk.CTkLabel(w, text=t['guide_text'], font=ctk.CTkFont(size=12),
+                     text_color=c['txt2'], justify='left', wraplength=340).pack(padx=24, anchor='w')
+        ctk.CTkButton(w, text='OK', width=90, height=32, corner_radius=10,
+                      fg_color=c['acc'], hover_color=c['acc_h'],
+                      command=w.destroy).pack(pady=(14, 16))
+
+    # ───────────── FFmpeg ─────────────
+
+    def _ss(self, txt: str) -> None:
+        self.after(0, lambda: self._status.configure(text=txt))
+
+    def _ffmpeg_check(self) -> None:
+        if provision.ready():
+            self._ss(self.t['ffmpeg_installed']); return
+
+        self._ss(self.t['ffmpeg_downloading'])
+        try:
+            if not provision.ensure():
+                raise RuntimeError('ffmpeg not accessible')
+            self._ss(self.t['ffmpeg_installed'])
+        except Exception as e:
+            self._ss(self.t['ffmpeg_failed'])
+            self.after(0, lambda: messagebox.showerror(self.t['error'], str(e)))
+
+    # ───────────── DOWNLOAD ─────────────
+
+    def _go(self) -> None:
+        t = self.t
+        urls = self._url.get().split()
+        if not urls:
+            messagebox.showwarning(t['error'], 'URL boş / empty')
+            return
+
+        is_playlist = self._mode_seg.get() in [_TR['mode_playlist'], _EN['mode_playlist']]
+        for url in urls:
+            job = self._engine.submit(Job(
+                url, self._plat_seg.get(), self._fmt_seg.get(), self._qual_seg.get(),
+                self._dir.get().strip(), is_playlist))
+            self._busy = True
+            if job.mix:
+                self._ss(t['mix_detected'])
+        self._url.delete(0, 'end')
+
+    def _on_job(self, job: Job) -> None:
+        # Worker threads only report state changes; progress is polled in _tick.
+        if job.state not in ('queued', 'running') and not self._engine.active():
+            self.after(0, self._batch_done)
+
+    def _tick(self) -> None:
+        if self._busy and self._engine.active():
+            snap = self._engine.meter.snapshot()
+            done, total = self._engine.batch()
+            txt = (f"{self.t['downloading']} {done}/{total}  •  "
+                   f"{fmt_rate(snap['rate'])}  •  {fmt_eta(snap['eta'])}")
+            if txt != self._status.cget('text'):
+                self._status.configure(text=txt)
+            self._prog.set(self._engine.progress())
+        self.after(_UI_MS, self._tick)
+
+    def _batch_done(self) -> None:
+        if not self._busy or self._engine.active():
+            return
+        self._busy = False
+        t = self.t
+        failed = list(self._engine.failed)
+        if failed:
+            self._status.configure(text='')
+            messagebox.showerror(t['error'], '\n'.join(f'{j.url}: {j.error}' for j in failed))
+        else:
+            self._prog.set(1.0)
+            self._status.configure(text=t['download_complete'])
+            messagebox.showinfo(t['success'], t['download_complete'])
@@ -0,0 +1,103 @@
+import os
+import json
+import time
+import threading
+from typing import Any
+from settings import CFG_DIR
+
+# ─── Job journal ───
+_FILE = os.path.join(CFG_DIR, 'journal.jsonl')
+_OPEN = ('queued', 'running')
+
+
+class Journal:
+    """Append-only JSON-lines log of job state, written in batches.
+
+    `log` only appends to an in-memory list; a background thread flushes
+    and fsyncs every `flush_s`, so the download path never touches disk.
+    Once `compact_at` finished records have been written the file is
+    rewritten to just the open jobs, so a long `--serve` run stays small.
+    """
+
+    def __init__(self, path: str = _FILE, flush_s: float = 0.5, compact_at: int = 1000) -> None:
+        self.path = path
+        self._buf: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._io = threading.Lock()  # one writer at a time, in order
+        self._stop = threading.Event()
+        self._flush_s = flush_s
+        self._compact_at = compact_at
+        self._done = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        threading.Thread(target=self._loop, daemon=True, name='journal').start()
+
+    def log(self, op: str, uid: str, **fields: Any) -> None:
+        rec = {'op': op, 'uid': uid, 't': round(time.time(), 3), **fields}
+        with self._lock:
+            self._buf.append(rec)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._flush_s):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flush thread and write what is left."""
+        self._stop.set()
+        self.flush()
+
+    def flush(self) -> None:
+        with self._io:
+            self._write()
+            if self._done >= self._compact_at:
+                self._compact()
+
+    def _write(self) -> None:
+        with self._lock:
+            buf, self._buf = self._buf, []
+        if not buf:
+            return
+        data = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in buf)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._done += sum(r['op'] not in _OPEN and r['op'] != 'part' for r in buf)
+
+    def pending(self) -> list[dict[str, Any]]:
+        """Unfinished jobs from the last session; compacts the file to just those."""
+        with self._io:
+            self._write()
+            return self._compact()
+
+    def _compact(self) -> list[dict[str, Any]]:
+        """Rewrite the file to the open jobs and their parts; caller holds `_io`."""
+        self._done = 0
+        jobs: dict[str, dict[str, Any]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash
+                    uid = rec.get('uid')
+                    if rec.get('op') == 'queued':
+                        jobs[uid] = {'uid': uid, 'job': rec['job'], 'parts': []}
+                    elif uid in jobs:
+                        if rec['op'] == 'part':
+                            jobs[uid]['parts'].append(rec['path'])
+                        elif rec['op'] not in _OPEN:
+                            del jobs[uid]
+        except FileNotFoundError:
+            return []
+        todo = list(jobs.values())
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for j in todo:
+                f.write(json.dumps({'op': 'queued', 'uid': j['uid'], 'job': j['job']},
+                                   ensure_ascii=False) + '\n')
+                for p in j['parts']:
+                    f.write(json.dumps({'op': 'part', 'uid': j['uid'], 'path': p},
+                                       ensure_ascii=False) + '\n')
+        os.replace(tmp, self.path)
+        return todo
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextlib
+from logging.handlers import RotatingFileHandler
+from typing import Any, Iterator
+from settings import CFG_DIR
+
+# ─── Job metrics ───
+_FILE = os.path.join(CFG_DIR, 'metrics.jsonl')
+
+
+class Spans:
+    """Wall time per phase of one job. A phase may open and close several
+    times (e.g. one download per merged stream); the times add up."""
+
+    def __init__(self, first: str = '') -> None:
+        self.t0 = time.monotonic()
+        self.total: dict[str, float] = {}
+        self._open: dict[str, float] = {first: self.t0} if first else {}
+
+    def start(self, phase: str) -> None:
+        self._open.setdefault(phase, time.monotonic())
+
+    def stop(self, phase: str) -> None:
+        t = self._open.pop(phase, None)
+        if t is not None:
+            self.total[phase] = self.total.get(phase, 0.0) + time.monotonic() - t
+
+    @contextlib.contextmanager
+    def __call__(self, phase: str) -> Iterator[None]:
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop(phase)
+
+    def close(self) -> float:
+        for phase in list(self._open):
+            self.stop(phase)
+        return time.monotonic() - self.t0
+
+
+def _label(v: str) -> str:
+    return v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """One JSON line per finished job in a size-rotated log, plus running
+    totals that `prometheus` renders in the text exposition format.
+
+    If `prom` is set the totals are also rewritten there after every job,
+    for a node_exporter textfile collector or similar scraper.
+    """
+
+    def __init__(self, path: str = _FILE, prom: str = '',
+                 max_bytes: int = 5 << 20, backups: int = 3) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.prom = prom
+        self._log = logging.getLogger(f'easydownload.metrics.{id(self)}')
+        self._log.propagate = False
+        self._log.setLevel(logging.INFO)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                      encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._log.addHandler(handler)
+        self._lock = threading.Lock()
+        self._io = threading.Lock()  # one writer of `prom` at a time
+        self._jobs: dict[tuple[str, str], int] = {}
+        self._phases: dict[str, list[float]] = {}
+        self._bytes = 0
+        self._retries = 0
+        self._hits = 0
+
+    def record(self, job: Any) -> None:
+        wall = job.spans.close()
+        rec = {'t': round(time.time(), 3), 'uid': job.uid, 'url': job.url,
+               'platform': job.platform, 'format': job.fmt, 'quality': job.qual,
+               'state': job.state, 'error': job.error.strip(),
+               'seconds': round(wall, 3),
+               'spans': {k: round(v, 3) for k, v in job.spans.total.items()},
+               'bytes': job.bytes, 'retries': job.retries,
+               'cache_hit': job.cached, 'transcoded': job.transcoded}
+        self._log.info(json.dumps(rec, ensure_ascii=False))
+        with self._lock:
+            key = (job.platform, job.state)
+            self._jobs[key] = self._jobs.get(key, 0) + 1
+            for phase, sec in job.spans.total.items():
+                acc = self._phases.setdefault(phase, [0.0, 0])
+                acc[0] += sec
+                acc[1] += 1
+            self._bytes += job.bytes
+            self._retries += job.retries
+            self._hits += bool(job.cached)
+        if self.prom:
+            self.dump(self.prom)
+
+    def prometheus(self) -> str:
+        with self._lock:
+            jobs = dict(self._jobs)
+            phases = {k: tuple(v) for k, v in self._phases.items()}
+            totals = (self._bytes, self._retries, self._hits)
+        out = ['# HELP easydownload_jobs_total Finished jobs by platform and state.',
+               '# TYPE easydownload_jobs_total counter']
+        out += [f'easydownload_jobs_total{{platform="{_label(p)}",state="{_label(s)}"}} {n}'
+                for (p, s), n in sorted(jobs.items())]
+        for name, help_, v in zip(('bytes', 'retries', 'cache_hits'),
+                                  ('Bytes downloaded.', 'Download retries.',
+                                   'Jobs resolved from the info cache.'), totals):
+            out += [f'# HELP easydownload_{name}_total {help_}',
+                    f'# TYPE easydownload_{name}_total counter',
+                    f'easydownload_{name}_total {v}']
+        out += ['# HELP easydownload_phase_seconds Time spent per job phase.',
+                '# TYPE easydownload_phase_seconds summary']
+        for phase, (sec, n) in sorted(phases.items()):
+            out += [f'easydownload_phase_seconds_sum{{phase="{_label(phase)}"}} {sec:.3f}',
+                    f'easydownload_phase_seconds_count{{phase="{_label(phase)}"}} {n}']
+        return '\n'.join(out) + '\n'
+
+    def dump(self, path: str) -> None:
+        with self._io:
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus())
+            os.replace(tmp, path)
@@ -0,0 +1,130 @@
+import os
+import subprocess
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+# ─── Transcode stage ───
+_CODECS = {
+    'mp3': ('mp3', ['-c:a', 'libmp3lame']),
+    'flac': ('flac', ['-c:a', 'flac']),
+}
+
+
+_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def needs_transcode(info: dict[str, Any], codec: str, quality: str) -> bool:
+    """False when the selected stream can simply be copied into the target codec."""
+    acodec = (info.get('acodec') or '').split('.')[0].lower()
+    if acodec != codec:
+        return True
+    if codec != 'mp3':
+        return False
+    # Re-encoding a lower bitrate up gains nothing; only shrink clearly larger ones.
+    abr = info.get('abr') or info.get('tbr')
+    return not abr or abr > int(quality) * 1.1
+
+
+def _cmd(src: str, codec: str, quality: str, dst: str, copy: bool = False) -> list[str]:
+    ext, args = _CODECS[codec]
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-i', src, '-vn']
+    if copy:
+        cmd += ['-c:a', 'copy']
+    else:
+        cmd += args + (['-b:a', f'{quality}k'] if codec == 'mp3' else [])
+    return cmd + ['-f', ext, dst]
+
+
+def transcode(src: str, codec: str, quality: str, copy: bool = False) -> str:
+    """Encode `src` to `codec` next to it, replace atomically, drop the source."""
+    base = os.path.splitext(src)[0]
+    final = base + '.' + _CODECS[codec][0]
+    if copy and os.path.abspath(src) == os.path.abspath(final):
+        return final
+    tmp = base + '.enc.part'
+    try:
+        subprocess.run(_cmd(src, codec, quality, tmp, copy), check=True, capture_output=True,
+                       creationflags=_NO_WINDOW)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, final)
+    if os.path.abspath(src) != os.path.abspath(final):
+        os.remove(src)
+    return final
+
+
+def stream_encode(url: str, headers: dict[str, str], base: str, codec: str, quality: str,
+                  hook: Callable[[int, int], None] | None = None,
+                  chunk: int = 1 << 16, copy: bool = False) -> str:
+    """Pipe an HTTP audio stream straight into ffmpeg; no intermediate file."""
+    final = base + '.' + _CODECS[codec][0]
+    tmp = base + '.enc.part'
+    # stderr goes to a file: a pipe nobody reads until the end can fill up
+    # on noisy input and stall ffmpeg, and with it our stdin writes.
+    with tempfile.TemporaryFile() as log:
+        proc = subprocess.Popen(_cmd('pipe:0', codec, quality, tmp, copy), stdin=subprocess.PIPE,
+                                stdout=subprocess.DEVNULL, stderr=log,
+                                creationflags=_NO_WINDOW)
+        try:
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+                    total = int(r.headers.get('Content-Length') or 0)
+                    done = 0
+                    while True:
+                        buf = r.read(chunk)
+                        if not buf:
+                            break
+                        proc.stdin.write(buf)
+                        done += len(buf)
+                        if hook:
+                            hook(done, total)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+            if proc.wait() != 0:
+                log.seek(0)
+                raise subprocess.CalledProcessError(proc.returncode, 'ffmpeg', stderr=log.read())
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    os.replace(tmp, final)
+    return final
+
+
+class Transcoder:
+    """Runs ffmpeg encodes off the download threads.
+
+    Each task drives its own ffmpeg process, so the pool is effectively a
+    process pool sized to the core count. `submit` blocks while `backlog`
+    raw files are already waiting, which in turn pauses new downloads.
+    """
+
+    def __init__(self, workers: int = 0, backlog: int = 0) -> None:
+        self.workers = workers or os.cpu_count() or 2
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='ffmpeg')
+        self._slots = threading.BoundedSemaphore(backlog or 2 * self.workers)
+
+    def submit(self, src: str, codec: str, quality: str,
+               done: Callable[[str, Exception | None], None]) -> None:
+        self._slots.acquire()
+        fut = self._pool.submit(transcode, src, codec, quality)
+
+        def _cb(f: Future) -> None:
+            self._slots.release()
+            err = f.exception()
+            done('' if err else f.result(), err)
+
+        fut.add_done_callback(_cb)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,65 @@
+import time
+import threading
+from typing import Any
+
+
+# ─── Progress aggregation ───
+def fmt_rate(bps: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if bps < 1024 or unit == 'GB':
+            return f'{bps:.1f} {unit}/s'
+        bps /= 1024
+    return ''
+
+
+def fmt_eta(sec: float | None) -> str:
+    if sec is None:
+        return '--:--'
+    m, s = divmod(int(sec), 60)
+    h, m = divmod(m, 60)
+    return f'{h}:{m:02d}:{s:02d}' if h else f'{m}:{s:02d}'
+
+
+class Progress:
+    """Byte counters from any number of jobs, read at the UI refresh rate.
+
+    `update` is called from download hooks and only stores one tuple, so it
+    takes no lock; `snapshot` does the summing and rate smoothing.
+    """
+
+    def __init__(self, smooth: float = 0.3) -> None:
+        self._live: dict[int, dict[str, tuple[int, int]]] = {}
+        self._retired = 0
+        self._lock = threading.Lock()
+        self._smooth = smooth
+        self._last = (time.monotonic(), 0)
+        self.rate = 0.0
+
+    def update(self, job: int, name: str, done: int, total: int) -> int:
+        """Record a file's byte count; returns the bytes added since the last call."""
+        files = self._live.get(job)
+        if files is None:
+            files = self._live.setdefault(job, {})
+        prev = files.get(name)
+        files[name] = (done, total)
+        return done - prev[0] if prev else done
+
+    def finish(self, job: int) -> None:
+        with self._lock:
+            files = self._live.pop(job, None)
+            if files:
+                self._retired += sum(d for d, _ in list(files.values()))
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            live = [v for files in list(self._live.values()) for v in list(files.values())]
+            moved = self._retired + sum(d for d, _ in live)
+        now = time.monotonic()
+        t0, b0 = self._last
+        if now - t0 > 0:
+            inst = max(moved - b0, 0) / (now - t0)
+            self.rate += self._smooth * (inst - self.rate)
+        self._last = (now, moved)
+        left = sum(max(t - d, 0) for d, t in live if t)
+        eta = left / self.rate if self.rate > 0 and left else None
+        return {'bytes': moved, 'rate': self.rate, 'eta': eta, 'active': len(live)}
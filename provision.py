@@ -0,0 +1,217 @@
+import io
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import zipfile
+import subprocess
+import urllib.request
+from typing import Any, BinaryIO
+from segmented import connect, probe, request_path
+from staging import sha256
+from settings import CFG_DIR
+
+# ─── FFmpeg provisioning ───
+_RECORD = os.path.join(CFG_DIR, 'ffmpeg.json')
+_APP_BIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ffmpeg', 'bin')
+_ZIP_URL = 'https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip'
+_VER_URL = 'https://www.gyan.dev/ffmpeg/builds/release-version'
+_EXE = '.exe' if sys.platform.startswith('win') else ''
+_WANT = ('ffmpeg' + _EXE, 'ffprobe' + _EXE)
+
+
+def _use(bin_dir: str) -> None:
+    path = os.environ.get('PATH', '')
+    if bin_dir not in path.split(os.pathsep):
+        os.environ['PATH'] = bin_dir + os.pathsep + path
+
+
+def _stamp(path: str, digest: str = '') -> dict[str, Any]:
+    st = os.stat(path)
+    return {'sha256': digest or sha256(path), 'size': st.st_size, 'mtime': st.st_mtime_ns}
+
+
+def _write_record(bin_dir: str, version: str, files: dict[str, dict[str, Any]],
+                  record: str = _RECORD) -> None:
+    os.makedirs(os.path.dirname(record), exist_ok=True)
+    tmp = record + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'dir': bin_dir, 'version': version, 'files': files}, f)
+    os.replace(tmp, record)
+
+
+def _read_record(record: str = _RECORD) -> dict[str, Any]:
+    try:
+        with open(record, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def cached(record: str = _RECORD) -> str | None:
+    """Bin dir from the record if its binaries are unchanged since they were hashed.
+
+    Only stats the recorded files; the checksums are verified at install
+    time, and again by `verify` when a stat no longer matches.
+    """
+    try:
+        rec = _read_record(record)
+        for name, want in rec['files'].items():
+            st = os.stat(os.path.join(rec['dir'], name))
+            if st.st_size != want['size'] or st.st_mtime_ns != want['mtime']:
+                return None
+        return rec['dir'] if rec['files'] else None
+    except Exception:
+        return None
+
+
+def verify(record: str = _RECORD) -> str | None:
+    """Re-hash the recorded binaries; if intact, refresh their stamps and
+    return the bin dir (a copy or restore changes mtimes, not content)."""
+    rec = _read_record(record)
+    try:
+        files = {n: _stamp(os.path.join(rec['dir'], n)) for n in rec['files']}
+        if not files or any(files[n]['sha256'] != w['sha256'] for n, w in rec['files'].items()):
+            return None
+    except Exception:
+        return None
+    _write_record(rec['dir'], rec.get('version', ''), files, record)
+    return rec['dir']
+
+
+def ready() -> bool:
+    """Put a usable ffmpeg on PATH without any network access."""
+    d = cached() or verify()
+    if d:
+        _use(d)
+        return True
+    if shutil.which('ffmpeg'):
+        return True
+    if shutil.which('ffmpeg', path=_APP_BIN):
+        _write_record(_APP_BIN, 'local', {n: _stamp(os.path.join(_APP_BIN, n))
+                                          for n in _WANT if os.path.exists(os.path.join(_APP_BIN, n))})
+        _use(_APP_BIN)
+        return True
+    return False
+
+
+class _RangeFile(io.RawIOBase):
+    """Seekable read-only view of a remote file over one keep-alive connection."""
+
+    def __init__(self, url: str, size: int, block: int = 1 << 20) -> None:
+        self.url, self.size, self.block = url, size, block
+        self.pos = 0
+        self._buf, self._at = b'', 0
+        self._conn = connect(url)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, off: int, whence: int = 0) -> int:
+        base = {0: 0, 1: self.pos, 2: self.size}[whence]
+        self.pos = max(0, base + off)
+        return self.pos
+
+    def readinto(self, b: Any) -> int:
+        n = min(len(b), self.size - self.pos)
+        if n <= 0:
+            return 0
+        if not (self._at <= self.pos and self.pos + n <= self._at + len(self._buf)):
+            end = min(self.size, self.pos + max(n, self.block)) - 1
+            self._conn.request('GET', request_path(self.url), headers={'Range': f'bytes={self.pos}-{end}'})
+            r = self._conn.getresponse()
+            if r.status != 206:
+                raise OSError(f'HTTP {r.status} reading {self.url}')
+            self._buf, self._at = r.read(), self.pos
+        off = self.pos - self._at
+        chunk = self._buf[off:off + n]
+        b[:len(chunk)] = chunk
+        self.pos += len(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        self._conn.close()
+        super().close()
+
+
+def _open_zip(url: str) -> tuple[BinaryIO, str]:
+    """The archive as a seekable stream: ranged reads if possible, else a temp file."""
+    final, size = probe(url, {})
+    if size:
+        return io.BufferedReader(_RangeFile(final, size), 1 << 16), ''
+    fd, tmp = tempfile.mkstemp(suffix='.zip')
+    with os.fdopen(fd, 'wb') as f, urllib.request.urlopen(url) as r:
+        shutil.copyfileobj(r, f, 1 << 20)
+    return open(tmp, 'rb'), tmp
+
+
+def install(url: str = _ZIP_URL, dest: str = _APP_BIN, version: str = '',
+            record: str = _RECORD) -> str:
+    """Pull just the ffmpeg/ffprobe members out of the release ZIP into `dest`.
+
+    Nothing is downloaded if `dest` already holds that version intact.
+    """
+    if not version:
+        try:
+            with urllib.request.urlopen(_VER_URL, timeout=10) as r:
+                version = r.read().decode().strip()
+        except Exception:
+            version = 'unknown'
+    rec = _read_record(record)
+    if version != 'unknown' and rec.get('version') == version and rec.get('dir') == dest \
+            and verify(record):
+        _use(dest)
+        return dest
+    src, tmp = _open_zip(url)
+    files: dict[str, dict[str, Any]] = {}
+    try:
+        with zipfile.ZipFile(src) as z:
+            members = {os.path.basename(m.filename).lower(): m for m in z.infolist()
+                       if not m.is_dir()}
+            if _WANT[0] not in members:
+                raise RuntimeError(f'{_WANT[0]} missing')
+            os.makedirs(dest, exist_ok=True)
+            for name in _WANT:
+                if name not in members:
+                    continue
+                out = os.path.join(dest, name)
+                h = hashlib.sha256()
+                # ZipExtFile checks the member CRC as the stream is read.
+                with z.open(members[name]) as zf, open(out + '.tmp', 'wb') as f:
+                    for buf in iter(lambda: zf.read(1 << 20), b''):
+                        h.update(buf)
+                        f.write(buf)
+                os.replace(out + '.tmp', out)
+                if _EXE == '':
+                    os.chmod(out, 0o755)
+                files[name] = _stamp(out, h.hexdigest())
+    finally:
+        src.close()
+        if tmp:
+            os.remove(tmp)
+    _write_record(dest, version, files, record)
+    _use(dest)
+    return dest
+
+
+def ensure() -> str:
+    """`ready()` or provision: the release ZIP on Windows, spotdl's build elsewhere."""
+    if ready():
+        return shutil.which('ffmpeg') or ''
+    if sys.platform.startswith('win'):
+        return install()
+    subprocess.run([sys.executable, '-m', 'spotdl', '--download-ffmpeg'],
+                   check=True, capture_output=True, timeout=60)
+    home = os.path.join(os.path.expanduser('~'), '.spotdl')
+    if os.path.exists(os.path.join(home, 'ffmpeg')):
+        _write_record(home, 'spotdl', {'ffmpeg': _stamp(os.path.join(home, 'ffmpeg'))})
+        _use(home)
+    return shutil.which('ffmpeg') or ''
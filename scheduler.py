@@ -0,0 +1,154 @@
+import time
+import threading
+from typing import Any
+
+# ─── Bandwidth / platform scheduling ───
+# Per-platform defaults; settings.json 'limits' overrides any of them, e.g.
+# {"bandwidth_kb": 2048, "Instagram": {"jobs": 1, "rate": 0.2}}
+# 'jobs' caps concurrent connections, 'rate' is HTTP requests per second.
+_DEFAULTS: dict[str, dict[str, float]] = {
+    'YouTube': {'jobs': 4, 'rate': 2.0},
+    'Instagram': {'jobs': 2, 'rate': 0.5},
+    'TikTok': {'jobs': 2, 'rate': 1.0},
+    'Pinterest': {'jobs': 3, 'rate': 1.0},
+    'Spotify': {'jobs': 1, 'rate': 1.0},
+}
+
+
+class TokenBucket:
+    """Callers reserve tokens up front and sleep off any debt; rate 0 = unlimited."""
+
+    def __init__(self, rate: float, burst: float = 0) -> None:
+        self._lock = threading.Lock()
+        self._t = time.monotonic()
+        self.set_rate(rate, burst)
+        self._tokens = self.burst
+        self.waited = 0.0
+
+    def set_rate(self, rate: float, burst: float = 0) -> None:
+        self.rate = max(0.0, float(rate))
+        self.burst = burst or max(self.rate, 1.0)
+
+    def take(self, n: float = 1) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._t) * self.rate)
+            self._t = now
+            self._tokens -= n
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class _Platform:
+    def __init__(self, jobs: float, rate: float) -> None:
+        self.cap = self.limit = max(1, int(jobs))
+        self.active = 0
+        self.deferred: list[Any] = []
+        self.started = 0
+        self.requests = TokenBucket(rate)
+
+
+class Scheduler:
+    """Global byte-rate limit plus per-platform connection caps and request rates.
+
+    A running job holds one slot of its platform's cap; a segmented download
+    `borrow`s free slots for its extra connections. Jobs over the cap are
+    parked rather than blocking a worker, and handed back by `release` or
+    `give_back` when slots free up. `request` paces each HTTP request.
+    """
+
+    def __init__(self, cfg: dict[str, Any] | None = None) -> None:
+        cfg = cfg or {}
+        self.bandwidth = TokenBucket(float(cfg.get('bandwidth_kb', 0)) * 1024)
+        self._lock = threading.Lock()
+        self._plat: dict[str, _Platform] = {}
+        for name in set(_DEFAULTS) | {k for k, v in cfg.items() if isinstance(v, dict)}:
+            lim = {'jobs': 4, 'rate': 0.0, **_DEFAULTS.get(name, {}), **cfg.get(name, {})}
+            self._plat[name] = _Platform(lim['jobs'], lim['rate'])
+
+    def _p(self, name: str) -> _Platform:
+        with self._lock:
+            if name not in self._plat:
+                self._plat[name] = _Platform(4, 0)
+            return self._plat[name]
+
+    def acquire(self, job: Any) -> bool:
+        """Take a slot for `job`, or park it and return False."""
+        p = self._p(job.platform)
+        with self._lock:
+            if p.active >= p.cap:
+                p.deferred.append(job)
+                return False
+            p.active += 1
+            p.started += 1
+        p.requests.take(1)
+        return True
+
+    def release(self, platform: str) -> Any:
+        """Free a slot; returns a parked job of that platform to requeue, if any."""
+        p = self._p(platform)
+        with self._lock:
+            p.active -= 1
+            return p.deferred.pop(0) if p.deferred else None
+
+    def borrow(self, platform: str, n: int) -> int:
+        """Up to `n` extra connections for a job that already holds a slot.
+
+        Nothing is lent while jobs are parked: they come first.
+        """
+        p = self._p(platform)
+        with self._lock:
+            got = 0 if p.deferred else max(0, min(n, p.cap - p.active))
+            p.active += got
+        return got
+
+    def give_back(self, platform: str, n: int) -> list[Any]:
+        """Return borrowed connections; returns parked jobs that may now run."""
+        p = self._p(platform)
+        with self._lock:
+            p.active -= n
+            room = max(0, p.cap - p.active)
+            woken, p.deferred = p.deferred[:room], p.deferred[room:]
+        return woken
+
+    def request(self, platform: str) -> None:
+        """Wait for the platform's request rate before one HTTP request."""
+        self._p(platform).requests.take(1)
+
+    def rate(self, platform: str) -> float:
+        return self._p(platform).requests.rate
+
+    def set_cap(self, platform: str, jobs: int) -> list[Any]:
+        """Change a cap live; returns parked jobs that may now run."""
+        p = self._p(platform)
+        with self._lock:
+            p.cap = max(1, int(jobs))
+            room = max(0, p.cap - p.active)
+            woken, p.deferred = p.deferred[:room], p.deferred[room:]
+        return woken
+
+    def cap(self, platform: str) -> int:
+        return self._p(platform).cap
+
+    def limit(self, platform: str) -> int:
+        """The configured cap; `set_cap` moves `cap` but never this."""
+        return self._p(platform).limit
+
+    def consume(self, n: int) -> None:
+        if n > 0:
+            self.bandwidth.take(n)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            plats = {name: {'cap': p.cap, 'active': p.active, 'waiting': len(p.deferred),
+                            'started': p.started, 'rate': p.requests.rate,
+                            'throttled_s': round(p.requests.waited, 2)}
+                     for name, p in self._plat.items()}
+        return {'bandwidth_kb': self.bandwidth.rate / 1024,
+                'bandwidth_throttled_s': round(self.bandwidth.waited, 2),
+                'platforms': plats}
@@ -0,0 +1,165 @@
+import os
+import json
+import queue
+import threading
+import http.client
+import urllib.request
+from urllib.parse import urlsplit
+from typing import Callable
+from staging import BUF, check_space, preallocate
+
+# ─── Segmented HTTP downloader ───
+_SEG = 4 << 20
+_RETRIES = 3
+
+
+def probe(url: str, headers: dict[str, str]) -> tuple[str, int]:
+    """Final URL and size if the server honours byte ranges, else size 0."""
+    req = urllib.request.Request(url, headers={**headers, 'Range': 'bytes=0-0'})
+    with urllib.request.urlopen(req, timeout=20) as r:
+        rng = r.headers.get('Content-Range') or ''
+        if r.status != 206 or '/' not in rng:
+            return r.geturl(), 0
+        total = rng.rsplit('/', 1)[1]
+        return r.geturl(), int(total) if total.isdigit() else 0
+
+
+def connect(url: str) -> http.client.HTTPConnection:
+    u = urlsplit(url)
+    cls = http.client.HTTPSConnection if u.scheme == 'https' else http.client.HTTPConnection
+    return cls(u.netloc, timeout=30)
+
+
+def request_path(url: str) -> str:
+    u = urlsplit(url)
+    return (u.path or '/') + ('?' + u.query if u.query else '')
+
+
+class _Sidecar:
+    """Completed segment indices, rewritten atomically after every segment."""
+
+    def __init__(self, path: str, size: int, seg: int) -> None:
+        self.path = path
+        self.meta = {'size': size, 'seg': seg}
+        self.done: set[int] = set()
+        try:
+            with open(path, 'r') as f:
+                rec = json.load(f)
+            if rec.get('size') == size and rec.get('seg') == seg:
+                self.done = set(rec.get('done', []))
+        except Exception:
+            pass
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        self.done.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def mark(self, i: int) -> None:
+        with self._lock:
+            self.done.add(i)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({**self.meta, 'done': sorted(self.done)}, f)
+            os.replace(tmp, self.path)
+
+
+def fetch(url: str, dst: str, headers: dict[str, str] | None = None, conns: int = 4,
+          seg: int = _SEG, hook: Callable[[int, int], None] | None = None,
+          retry: Callable[[], None] | None = None,
+          pace: Callable[[], None] | None = None) -> bool:
+    """Download `url` to `dst` over `conns` keep-alive connections.
+
+    Returns False without touching `dst` if the server has no Range support,
+    so the caller can fall back. Interrupted runs resume from `dst.part` and
+    its `.segs` sidecar, fetching only the missing ranges. `pace` is called
+    before every HTTP request, e.g. to apply a request-rate limit.
+    """
+    headers = dict(headers or {})
+    pace = pace or (lambda: None)
+    pace()
+    url, size = probe(url, headers)
+    if size <= 0:
+        return False
+    part, side = dst + '.part', dst + '.segs'
+    marks = _Sidecar(side, size, seg)
+    if marks.done and not (os.path.exists(part) and os.path.getsize(part) == size):
+        marks.reset()  # the bytes those marks describe are gone
+    count = (size + seg - 1) // seg
+    if not marks.done and os.path.exists(part):
+        os.remove(part)
+    if not marks.done:
+        check_space(os.path.dirname(os.path.abspath(dst)), size)
+    with open(part, 'ab') as f:
+        if f.tell() < size:
+            preallocate(f, size)
+
+    todo: queue.Queue[int] = queue.Queue()
+    for i in range(count):
+        if i not in marks.done:
+            todo.put(i)
+    got = [sum(min(seg, size - i * seg) for i in marks.done)]
+    lock = threading.Lock()
+    errors: list[Exception] = []
+
+    def _work() -> None:
+        conn = connect(url)
+        try:
+            with open(part, 'r+b', buffering=BUF) as f:
+                while not errors:
+                    try:
+                        i = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    start, end = i * seg, min(size, (i + 1) * seg) - 1
+                    for attempt in range(_RETRIES):
+                        n = 0
+                        try:
+                            pace()
+                            conn.request('GET', request_path(url),
+                                         headers={**headers, 'Range': f'bytes={start}-{end}'})
+                            r = conn.getresponse()
+                            if r.status != 206:
+                                raise OSError(f'HTTP {r.status} for range {start}-{end}')
+                            f.seek(start)
+                            while True:
+                                buf = r.read(1 << 18)
+                                if not buf:
+                                    break
+                                f.write(buf)
+                                n += len(buf)
+                                with lock:
+                                    got[0] += len(buf)
+                                    if hook:
+                                        hook(got[0], size)
+                            if f.tell() != end + 1:
+                                raise OSError(f'short read for range {start}-{end}')
+                            break
+                        except (OSError, http.client.HTTPException) as e:
+                            with lock:
+                                got[0] -= n
+                            conn.close()
+                            conn = connect(url)
+                            if attempt == _RETRIES - 1:
+                                errors.append(e)
+                                return
+                            if retry:
+                                with lock:
+                                    retry()
+                    f.flush()
+                    marks.mark(i)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=_work, daemon=True)
+               for _ in range(max(1, min(conns, todo.qsize())))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    os.replace(part, dst)
+    os.remove(side)
+    return True
@@ -0,0 +1,33 @@
+import os
+import json
+import threading
+
+# ─── Settings ───
+CFG_DIR = os.path.join(os.path.expanduser('~'), 'EasyDownload')
+_CFG = os.path.join(CFG_DIR, 'settings.json')
+_LOCK = threading.Lock()
+
+
+def load() -> dict:
+    try:
+        with open(_CFG, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save(d: dict) -> None:
+    try:
+        os.makedirs(CFG_DIR, exist_ok=True)
+        with open(_CFG, 'w') as f:
+            json.dump(d, f)
+    except Exception:
+        pass
+
+
+def update(**keys) -> None:
+    """Write just `keys` into settings.json; the rest of the file is left as saved."""
+    with _LOCK:
+        d = load()
+        d.update(keys)
+        save(d)
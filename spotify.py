@@ -0,0 +1,76 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+# ─── Spotify worker ───
+_OUT = '{artists} - {title}.{output-ext}'
+
+Hook = Callable[[int, int, str], None]
+
+
+class SpotifyWorker:
+    """A single long-lived thread that owns the spotdl session.
+
+    spotdl's client is a per-process singleton bound to the event loop of the
+    thread that created it, so every batch runs on this thread and the
+    matcher/client start-up is paid once per session.
+    """
+
+    def __init__(self) -> None:
+        self._q: queue.Queue[tuple[list[str], str, Hook | None, Future]] = queue.Queue()
+        self._sp: Any = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, urls: list[str], out: str, hook: Hook | None = None) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True,
+                                                name='spotdl')
+                self._thread.start()
+        self._q.put((urls, out, hook, fut))
+        return fut
+
+    def download(self, urls: list[str], out: str, hook: Hook | None = None) -> list[str]:
+        return self.submit(urls, out, hook).result()
+
+    def _session(self) -> Any:
+        if self._sp is None:
+            from spotdl import Spotdl
+            from spotdl.utils.config import DEFAULT_CONFIG
+            self._sp = Spotdl(client_id=DEFAULT_CONFIG['client_id'],
+                              client_secret=DEFAULT_CONFIG['client_secret'],
+                              downloader_settings={'simple_tui': True})
+        return self._sp
+
+    def _loop(self) -> None:
+        while True:
+            urls, out, hook, fut = self._q.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(self._batch(urls, out, hook))
+            except BaseException as e:
+                fut.set_exception(e)
+
+    def _batch(self, urls: list[str], out: str, hook: Hook | None) -> list[str]:
+        sp = self._session()
+        sp.downloader.settings['output'] = os.path.join(out, _OUT)
+        songs = sp.search(urls)
+        if not songs:
+            raise RuntimeError('No Spotify tracks found')
+        paths, missed = [], []
+        for i, song in enumerate(songs, 1):
+            _, path = sp.download(song)
+            if path:
+                paths.append(str(path))
+            else:
+                missed.append(song.display_name)
+            if hook:
+                hook(i, len(songs), song.display_name)
+        if missed:
+            raise RuntimeError('Not found: ' + ', '.join(missed))
+        return paths
@@ -0,0 +1,67 @@
+import os
+import sys
+import errno
+import shutil
+import hashlib
+from typing import Any, BinaryIO
+
+# ─── Output staging ───
+# Intermediates live in a hidden folder inside the target folder, so every
+# finalising step is a rename on the same filesystem, never a copy.
+STAGE = '.easydownload'
+BUF = 1 << 20
+_RESERVE = 64 << 20
+
+
+def paths(out: str) -> dict[str, str]:
+    """yt-dlp `paths`: final files in `out`, .part and merge inputs staged beside them."""
+    return {'home': out, 'temp': os.path.join(out, STAGE)}
+
+
+def sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for buf in iter(lambda: f.read(BUF), b''):
+            h.update(buf)
+    return h.hexdigest()
+
+
+def cleanup(out: str) -> None:
+    try:
+        os.rmdir(os.path.join(out, STAGE))
+    except OSError:
+        pass  # missing, or another download is still using it
+
+
+def preallocate(f: BinaryIO, size: int) -> None:
+    """Reserve `size` bytes up front so the file is not grown chunk by chunk."""
+    if size <= 0:
+        return
+    if sys.platform.startswith('linux'):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+    # NTFS and APFS allocate on extend; elsewhere this is at least a sparse reserve.
+    f.truncate(size)
+
+
+def estimate(info: dict[str, Any], convert: bool) -> int:
+    """Bytes needed on disk for `info`'s selected formats, 0 if unknown.
+
+    Merges and audio conversions hold input and output at the same time.
+    """
+    fmts = info.get('requested_formats') or [info]
+    size = sum(f.get('filesize') or f.get('filesize_approx') or 0 for f in fmts)
+    return size * 2 if convert or len(fmts) > 1 else size
+
+
+def check_space(folder: str, need: int) -> None:
+    if need <= 0:
+        return
+    free = shutil.disk_usage(folder).free
+    if free < need + _RESERVE:
+        raise OSError(errno.ENOSPC, f'Not enough free space in {folder}: '
+                                    f'{need >> 20} MB needed, {free >> 20} MB free')
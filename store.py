@@ -0,0 +1,186 @@
+import os
+import sys
+import shutil
+import itertools
+import sqlite3
+import threading
+from archive import Key
+from staging import sha256
+from settings import CFG_DIR
+
+# ─── Content-addressed store ───
+_ROOT = os.path.join(CFG_DIR, 'store')
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Copy-on-write clone (Btrfs/XFS); False where unsupported."""
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+def _same(a: str, b: str) -> bool:
+    """True if `a` and `b` are one file or hold the same bytes."""
+    try:
+        if os.path.samefile(a, b):
+            return True
+        return os.path.getsize(a) == os.path.getsize(b) and sha256(a) == sha256(b)
+    except OSError:
+        return False
+
+
+def place(src: str, dst: str) -> str:
+    """Make `dst` a reflink or hard link of `src`, copying only if neither works.
+
+    Returns how it was placed. `dst` appears atomically.
+    """
+    tmp = dst + '.lnk'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    how = 'reflink'
+    if not _reflink(src, tmp):
+        try:
+            os.link(src, tmp)
+            how = 'link'
+        except OSError:
+            shutil.copy2(src, tmp)
+            how = 'copy'
+    os.replace(tmp, dst)
+    return how
+
+
+class Store:
+    """Media files kept once under their sha256, linked into every folder
+    that asks for them.
+
+    `media` maps an archive key (extractor, id, format, quality) to a blob;
+    `links` lists every path materialised from a blob and is its reference
+    count. `gc` drops links whose file is gone and then unreferenced blobs.
+    Keep `root` on the same drive as the download folders so hard links work.
+    """
+
+    def __init__(self, root: str = '') -> None:
+        root = root or _ROOT
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, 'store.db'), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(
+            'CREATE TABLE IF NOT EXISTS blobs ('
+            'hash TEXT PRIMARY KEY, ext TEXT, size INTEGER, mtime INTEGER) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS media ('
+            'extractor TEXT, id TEXT, fmt TEXT, qual TEXT, hash TEXT, name TEXT, '
+            'PRIMARY KEY (extractor, id, fmt, qual)) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS links (path TEXT PRIMARY KEY, hash TEXT) WITHOUT ROWID;'
+            'CREATE INDEX IF NOT EXISTS links_hash ON links (hash);')
+        self._db.commit()
+
+    def _blob(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + ext)
+
+    def lookup(self, key: Key | None) -> tuple[str, str] | None:
+        """(blob path, original file name) for `key` if the blob is intact."""
+        if key is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                'SELECT b.hash, b.ext, b.size, b.mtime, m.name FROM media m '
+                'JOIN blobs b ON b.hash = m.hash '
+                'WHERE m.extractor=? AND m.id=? AND m.fmt=? AND m.qual=?', key).fetchone()
+        if row is None:
+            return None
+        blob = self._blob(row[0], row[1])
+        try:
+            st = os.stat(blob)
+        except OSError:
+            return None
+        # A hard-linked copy edited in place changes the blob too.
+        if st.st_size != row[2] or st.st_mtime_ns != row[3]:
+            return None
+        return blob, row[4]
+
+    def materialize(self, key: Key | None, folder: str) -> str | None:
+        """Link the stored file for `key` into `folder`; None on a miss.
+
+        A different file already under the stored name is left alone and
+        the blob goes to 'name (1).ext', 'name (2).ext', ... instead.
+        """
+        hit = self.lookup(key)
+        if hit is None:
+            return None
+        blob, name = hit
+        stem, ext = os.path.splitext(name)
+        for n in itertools.count():
+            dst = os.path.join(folder, f'{stem} ({n}){ext}' if n else name)
+            if not os.path.exists(dst):
+                place(blob, dst)
+                break
+            if _same(dst, blob):
+                break
+        self._ref(dst, os.path.basename(blob).split('.')[0])
+        return dst
+
+    def ingest(self, key: Key | None, path: str) -> str:
+        """Move a finished download into the store and link it back to `path`."""
+        if key is None or not path or not os.path.isfile(path):
+            return path
+        digest = sha256(path)
+        ext = os.path.splitext(path)[1]
+        blob = self._blob(digest, ext)
+        # One lock hold from placement to the link row, so `gc` cannot see
+        # the blob unreferenced in between and delete it.
+        with self._lock:
+            known = self._db.execute('SELECT 1 FROM blobs WHERE hash=?', (digest,)).fetchone()
+            if known and os.path.exists(blob):
+                place(blob, path)  # same bytes already stored: share them
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                place(path, blob)
+            st = os.stat(blob)
+            self._db.execute('INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?)',
+                             (digest, ext, st.st_size, st.st_mtime_ns))
+            self._db.execute('INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?)',
+                             (*key, digest, os.path.basename(path)))
+            self._db.execute('INSERT OR REPLACE INTO links VALUES (?, ?)',
+                             (os.path.abspath(path), digest))
+            self._db.commit()
+        return path
+
+    def _ref(self, path: str, digest: str) -> None:
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO links VALUES (?, ?)',
+                             (os.path.abspath(path), digest))
+            self._db.commit()
+
+    def gc(self) -> int:
+        """Forget deleted links and remove blobs nothing refers to; returns blobs freed."""
+        with self._lock:
+            links = self._db.execute('SELECT path FROM links').fetchall()
+        gone = [(p,) for (p,) in links if not os.path.exists(p)]
+        with self._lock:
+            self._db.executemany('DELETE FROM links WHERE path=?', gone)
+            dead = self._db.execute(
+                'SELECT hash, ext FROM blobs WHERE hash NOT IN (SELECT hash FROM links)').fetchall()
+            for digest, ext in dead:
+                try:
+                    os.remove(self._blob(digest, ext))
+                except FileNotFoundError:
+                    pass
+            self._db.executemany('DELETE FROM media WHERE hash=?', [(d,) for d, _ in dead])
+            self._db.executemany('DELETE FROM blobs WHERE hash=?', [(d,) for d, _ in dead])
+            self._db.commit()
+        return len(dead)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('yt_dlp')
+import bench  # noqa: E402
+import daemon  # noqa: E402
+from engine import Engine  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def api():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), daemon._handler(Engine(1), daemon._Registry()))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    def _call(path: str, body: object = None, **headers: str) -> tuple[int, dict]:
+        data = None
+        if body is not None:
+            headers = {'Content-Type': 'application/json', **headers}
+            data = json.dumps(body).encode()
+        req = urllib.request.Request(f'http://127.0.0.1:{srv.server_address[1]}{path}',
+                                     data=data, headers=headers)
+        try:
+            with urllib.request.urlopen(req) as r:
+                return r.status, json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    yield _call
+    srv.shutdown()
+
+
+@pytest.fixture
+def post(api):
+    return lambda body, **headers: api('/jobs', body, **headers)
+
+
+@pytest.mark.parametrize('body', [
+    {'urls': 'https://youtu.be/x'},
+    {'urls': []},
+    {'urls': ['https://youtu.be/x', 5]},
+    {'url': 'https://youtu.be/x', 'format': 'AVI'},
+    {'url': 'https://youtu.be/x', 'format': 'MP3', 'quality': 'high'},
+    {'url': 'https://youtu.be/x', 'format': 'MP4', 'quality': '320'},
+    {'url': 'https://youtu.be/x', 'out': ['a']},
+    ['https://youtu.be/x'],
+    {},
+])
+def test_bad_requests_are_rejected(post, body: object) -> None:
+    code, res = post(body)
+    assert code == 400
+    assert res['error'].startswith('bad request')
+
+
+@pytest.mark.parametrize('headers, code', [
+    ({'Content-Type': 'text/plain'}, 415),
+    ({'Content-Type': 'application/x-www-form-urlencoded'}, 415),
+    ({'Origin': 'https://evil.example'}, 403),
+    ({'Host': 'evil.example:8787'}, 403),
+])
+def test_cross_site_requests_are_refused(post, headers: dict, code: int) -> None:
+    status, _ = post({'url': 'https://youtu.be/x'}, **headers)
+    assert status == code
+
+
+def test_job_downloads_from_stub_media(api, tmp_path) -> None:
+    media = tmp_path / 'media'
+    media.mkdir()
+    (media / 'clip.mp4').write_bytes(os.urandom(256 << 10))
+    srv = bench._Stub(str(media), 0, 0, True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        code, res = api('/jobs', {'url': srv.url + 'clip.mp4', 'format': 'MP4',
+                                  'quality': '360p', 'platform': 'Bench',
+                                  'out': str(tmp_path / 'out')})
+        assert code == 202
+        deadline = time.monotonic() + 30
+        while True:
+            _, job = api(f'/jobs/{res["ids"][0]}')
+            if job['state'] not in ('queued', 'running') or time.monotonic() > deadline:
+                break
+            time.sleep(0.1)
+    finally:
+        srv.shutdown()
+    assert job['state'] == 'done', job
+    assert [p.name for p in (tmp_path / 'out').iterdir() if p.is_file()]
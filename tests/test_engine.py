@@ -0,0 +1,44 @@
+import tempfile
+import threading
+
+import pytest
+
+pytest.importorskip('yt_dlp')
+from engine import Engine, Job  # noqa: E402
+
+
+# ─── Worker resilience ───
+def test_raising_callback_fails_the_job_and_keeps_the_worker() -> None:
+    def on_event(job: Job) -> None:
+        if job.state == 'running' and job.url.endswith('boom'):
+            raise RuntimeError('callback broke')
+
+    engine = Engine(1, on_event)
+    out = tempfile.mkdtemp()
+    bad = engine.submit(Job('http://127.0.0.1:1/boom', 'Bench', 'MP4', '360p', out))
+    ok = engine.submit(Job('http://127.0.0.1:1/next', 'Bench', 'MP4', '360p', out))
+    waiter = threading.Thread(target=engine.wait)
+    waiter.start()
+    waiter.join(30)
+    assert not waiter.is_alive()
+    assert bad.state == 'failed' and 'callback broke' in bad.error
+    assert ok.state == 'failed' and 'callback broke' not in ok.error  # the worker ran it
+
+
+def test_playlist_entries_keep_their_index_for_templates(tmp_path) -> None:
+    import yt_dlp
+    import bench
+    (tmp_path / 'clip.mp4').write_bytes(b'\0' * 4096)
+    srv = bench._Stub(str(tmp_path), 0, 0, True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    parent = Job('https://example.com/list', 'Bench', 'MP4', '360p', str(tmp_path), True)
+    parent.listing = {'id': 'PL1', 'title': 'Mix', 'uploader': None}
+    kid = Job(srv.url + 'clip.mp4', 'Bench', 'MP4', '360p', str(tmp_path), parent=parent, index=7)
+    try:
+        with yt_dlp.YoutubeDL({'quiet': True,
+                               'outtmpl': '%(playlist)s/%(playlist_index)s - %(title)s.%(ext)s'}) as ydl:
+            info = ydl.extract_info(kid.url, download=False, process=False)
+            sel = ydl.process_ie_result({**info, **kid.entry_fields()}, download=False)
+            assert ydl.prepare_filename(sel).endswith('Mix/7 - clip.mp4')
+    finally:
+        srv.shutdown()
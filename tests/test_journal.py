@@ -0,0 +1,41 @@
+import json
+import threading
+
+from journal import Journal
+
+
+# ─── Journal compaction and ordering ───
+def _lines(path: str) -> list[dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(ln) for ln in f]
+
+
+def test_finished_jobs_are_compacted_away(tmp_path) -> None:
+    j = Journal(str(tmp_path / 'journal.jsonl'), flush_s=60, compact_at=10)
+    j.log('queued', 'open', job={'url': 'u'})
+    for i in range(50):
+        j.log('queued', f'j{i}', job={'url': f'u{i}'})
+        j.log('done', f'j{i}')
+        j.flush()
+    j.close()
+    uids = {r['uid'] for r in _lines(j.path)}
+    assert 'open' in uids
+    assert len(uids) < 12
+
+
+def test_concurrent_flushes_keep_log_order(tmp_path) -> None:
+    j = Journal(str(tmp_path / 'journal.jsonl'), flush_s=60, compact_at=10 ** 9)
+
+    def writer() -> None:
+        for _ in range(200):
+            j.flush()
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(2000):
+        j.log('part', 'a', path=str(i))
+    for t in threads:
+        t.join()
+    j.close()
+    assert [int(r['path']) for r in _lines(j.path)] == list(range(2000))
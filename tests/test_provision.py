@@ -0,0 +1,59 @@
+import os
+import zipfile
+import threading
+
+import pytest
+
+import bench
+import provision
+
+MEMBERS = {'ffmpeg-7.1-essentials_build/bin/ffmpeg' + provision._EXE: b'ff' * 5000,
+           'ffmpeg-7.1-essentials_build/bin/ffprobe' + provision._EXE: b'fp' * 5000,
+           'ffmpeg-7.1-essentials_build/bin/ffplay' + provision._EXE: b'pl' * 5000,
+           'ffmpeg-7.1-essentials_build/doc/ffmpeg.html': b'<html></html>'}
+
+
+# ─── FFmpeg provisioning from a local stub archive ───
+@pytest.fixture(params=[True, False], ids=['ranges', 'no-ranges'])
+def stub(request, tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', os.environ.get('PATH', ''))  # install() prepends its bin dir
+    root = tmp_path / 'srv'
+    root.mkdir()
+    with zipfile.ZipFile(root / 'ffmpeg.zip', 'w', zipfile.ZIP_DEFLATED) as z:
+        for name, data in MEMBERS.items():
+            z.writestr(name, data)
+    srv = bench._Stub(str(root), 0, 0, request.param)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv.url + 'ffmpeg.zip'
+    srv.shutdown()
+
+
+def test_install_extracts_only_ffmpeg_and_ffprobe(stub, tmp_path) -> None:
+    dest, record = str(tmp_path / 'bin'), str(tmp_path / 'ffmpeg.json')
+    assert provision.install(stub, dest, version='7.1', record=record) == dest
+    assert sorted(os.listdir(dest)) == sorted(provision._WANT)
+    with open(os.path.join(dest, provision._WANT[0]), 'rb') as f:
+        assert f.read() == b'ff' * 5000
+    assert provision.cached(record) == dest
+
+
+def test_touched_binaries_are_reverified_not_refetched(stub, tmp_path) -> None:
+    dest, record = str(tmp_path / 'bin'), str(tmp_path / 'ffmpeg.json')
+    provision.install(stub, dest, version='7.1', record=record)
+    exe = os.path.join(dest, provision._WANT[0])
+    os.utime(exe, ns=(0, 0))
+    assert provision.cached(record) is None
+    assert provision.verify(record) == dest
+    assert provision.cached(record) == dest
+    with open(exe, 'ab') as f:
+        f.write(b'!')
+    assert provision.verify(record) is None
+
+
+def test_same_version_is_not_downloaded_again(stub, tmp_path) -> None:
+    dest, record = str(tmp_path / 'bin'), str(tmp_path / 'ffmpeg.json')
+    provision.install(stub, dest, version='7.1', record=record)
+    gone = 'http://127.0.0.1:1/ffmpeg.zip'  # would fail if fetched
+    assert provision.install(gone, dest, version='7.1', record=record) == dest
+    with pytest.raises(OSError):
+        provision.install(gone, dest, version='7.2', record=record)
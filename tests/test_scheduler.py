@@ -0,0 +1,39 @@
+import threading
+
+import bench
+from scheduler import Scheduler
+from segmented import fetch
+
+
+# ─── Connection caps and request pacing ───
+class _Job:
+    platform = 'Instagram'
+
+
+def test_segmented_connections_count_against_the_cap() -> None:
+    s = Scheduler({'Instagram': {'jobs': 2, 'rate': 0}})
+    assert s.acquire(_Job())
+    assert s.borrow('Instagram', 15) == 1  # one slot left of two
+    assert not s.acquire(_Job())  # parked: the borrowed slot is in use
+    assert s.give_back('Instagram', 1)  # the parked job may run now
+    assert s.borrow('Instagram', 15) == 1
+
+
+def test_parked_jobs_come_before_borrowing() -> None:
+    s = Scheduler({'Instagram': {'jobs': 1, 'rate': 0}})
+    assert s.acquire(_Job())
+    assert not s.acquire(_Job())
+    assert s.borrow('Instagram', 3) == 0
+
+
+def test_every_range_request_is_paced(tmp_path) -> None:
+    (tmp_path / 'f.bin').write_bytes(b'x' * (1 << 20))
+    srv = bench._Stub(str(tmp_path), 0, 0, True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    calls = []
+    try:
+        assert fetch(srv.url + 'f.bin', str(tmp_path / 'out.bin'), conns=2, seg=256 << 10,
+                     pace=lambda: calls.append(1))
+    finally:
+        srv.shutdown()
+    assert len(calls) == 1 + 4  # the probe plus one per range
@@ -0,0 +1,80 @@
+import os
+import json
+import threading
+
+import pytest
+
+import bench
+from segmented import fetch
+
+SEG = 64 << 10
+DATA = os.urandom(8 * SEG + 123)
+
+
+# ─── Segmented downloads against a local Range server ───
+@pytest.fixture
+def serve(tmp_path):
+    root = tmp_path / 'srv'
+    root.mkdir()
+    (root / 'f.bin').write_bytes(DATA)
+    servers = []
+
+    def _serve(ranges: bool = True) -> str:
+        srv = bench._Stub(str(root), 0, 0, ranges)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+        return srv.url + 'f.bin'
+
+    yield _serve
+    for srv in servers:
+        srv.shutdown()
+
+
+def _fetch(url: str, dst: str) -> tuple[bool, int]:
+    requests = []
+    ok = fetch(url, dst, conns=3, seg=SEG, pace=lambda: requests.append(1))
+    return ok, len(requests) - 1  # minus the probe
+
+
+def _partial(dst: str, done: list[int], part: bytes | None) -> None:
+    with open(dst + '.segs', 'w') as f:
+        json.dump({'size': len(DATA), 'seg': SEG, 'done': done}, f)
+    if part is not None:
+        with open(dst + '.part', 'wb') as f:
+            f.write(part)
+
+
+def _read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_full_fetch(serve, tmp_path) -> None:
+    dst = str(tmp_path / 'out.bin')
+    assert _fetch(serve(), dst) == (True, 9)
+    assert _read(dst) == DATA
+    assert not os.path.exists(dst + '.part') and not os.path.exists(dst + '.segs')
+
+
+def test_resume_fetches_only_missing_ranges(serve, tmp_path) -> None:
+    dst = str(tmp_path / 'out.bin')
+    part = bytearray(len(DATA))
+    part[:3 * SEG] = DATA[:3 * SEG]
+    _partial(dst, [0, 1, 2], bytes(part))
+    assert _fetch(serve(), dst) == (True, 6)
+    assert _read(dst) == DATA
+
+
+@pytest.mark.parametrize('part', [None, DATA[:SEG]], ids=['missing', 'short'])
+def test_marks_without_their_bytes_start_over(serve, tmp_path, part) -> None:
+    dst = str(tmp_path / 'out.bin')
+    _partial(dst, [0, 1, 2, 3], part)
+    assert _fetch(serve(), dst) == (True, 9)
+    assert _read(dst) == DATA
+
+
+def test_no_range_support_returns_false(serve, tmp_path) -> None:
+    dst = str(tmp_path / 'out.bin')
+    assert _fetch(serve(ranges=False), dst) == (False, 0)
+    assert not os.path.exists(dst)
+    assert not os.path.exists(dst + '.part')
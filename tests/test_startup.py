@@ -0,0 +1,59 @@
+import os
+import sys
+import subprocess
+
+# ─── Headless start-up budget ───
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('customtkinter', 'tkinter', 'yt_dlp')
+IMPORT_BUDGET_S = 1.0
+HELP_BUDGET_S = 2.0
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True,
+                          text=True, timeout=60)
+
+
+def test_cli_import_skips_heavy_modules() -> None:
+    r = _python('-c', 'import sys, cli; print(",".join(m for m in %r if m in sys.modules))'
+                % (HEAVY,))
+    assert r.returncode == 0, r.stderr
+    assert r.stdout.strip() == ''
+
+
+def test_cli_import_time_budget() -> None:
+    r = _python('-X', 'importtime', '-c', 'import cli')
+    assert r.returncode == 0, r.stderr
+    # "import time: self [us] | cumulative | name" -- the top-level cli line.
+    rows = [ln.split('|') for ln in r.stderr.splitlines() if ln.startswith('import time:')]
+    cumulative = next(int(cols[1]) for cols in rows if cols[2].strip() == 'cli')
+    assert cumulative / 1e6 < IMPORT_BUDGET_S
+
+
+def test_help_stays_headless_and_fast() -> None:
+    code = ('import sys, time\n'
+            't = time.perf_counter()\n'
+            'import main\n'
+            'try:\n'
+            '    main.main(["--help"])\n'
+            'except SystemExit:\n'
+            '    pass\n'
+            'loaded = ",".join(m for m in %r if m in sys.modules)\n'
+            'print(f"{time.perf_counter() - t}|{loaded}", file=sys.stderr)\n' % (HEAVY,))
+    r = _python('-c', code)
+    assert r.returncode == 0, r.stderr
+    elapsed, loaded = r.stderr.strip().splitlines()[-1].split('|')
+    assert 'usage: main.py' in r.stdout
+    assert loaded == ''
+    assert float(elapsed) < HELP_BUDGET_S
+
+
+def test_bad_quality_fails_before_ffmpeg_setup() -> None:
+    code = ('import sys, main\n'
+            'try:\n'
+            '    main.main(["--batch", "-", "-q", "999p"])\n'
+            'except SystemExit as e:\n'
+            '    print(e.code, "provision" in sys.modules)\n')
+    r = _python('-c', code)
+    assert "quality '999p' is not valid" in r.stderr
+    assert r.stdout.split() == ['2', 'False']
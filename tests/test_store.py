@@ -0,0 +1,41 @@
+import os
+
+from store import Store
+
+KEY = ('Generic', 'song', 'MP3', '320')
+
+
+# ─── Content-addressed store ───
+def _file(path: str, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def _links(store: Store) -> set[str]:
+    return {p for (p,) in store._db.execute('SELECT path FROM links')}
+
+
+def test_materialize_keeps_a_different_file_and_links_beside_it(tmp_path) -> None:
+    store = Store(str(tmp_path / 'store'))
+    store.ingest(KEY, _file(str(tmp_path / 'a' / 'Song.mp3'), b'320' * 1000))
+    other = _file(str(tmp_path / 'b' / 'Song.mp3'), b'128' * 1000)
+    dst = store.materialize(KEY, str(tmp_path / 'b'))
+    assert dst == str(tmp_path / 'b' / 'Song (1).mp3')
+    with open(other, 'rb') as f:
+        assert f.read() == b'128' * 1000
+    with open(dst, 'rb') as f:
+        assert f.read() == b'320' * 1000
+    assert os.path.abspath(other) not in _links(store)
+    assert store.materialize(KEY, str(tmp_path / 'b')) == dst  # idempotent
+    store.close()
+
+
+def test_materialize_reuses_an_identical_file(tmp_path) -> None:
+    store = Store(str(tmp_path / 'store'))
+    src = store.ingest(KEY, _file(str(tmp_path / 'a' / 'Song.mp3'), b'x' * 4096))
+    assert store.materialize(KEY, str(tmp_path / 'a')) == src
+    assert os.path.abspath(src) in _links(store)
+    assert store.gc() == 0
+    store.close()
@@ -0,0 +1,49 @@
+import pytest
+
+ctk = pytest.importorskip('customtkinter')
+pytest.importorskip('yt_dlp')
+import gui  # noqa: E402
+from engine import Engine  # noqa: E402
+
+
+# ─── Theme switch in place ───
+@pytest.fixture
+def app(monkeypatch):
+    import tkinter
+    # A bare engine and no settings file: nothing under ~/EasyDownload is touched.
+    monkeypatch.setattr(gui, 'load', lambda: {'theme': 'dark'})
+    monkeypatch.setattr(gui, 'update', lambda **keys: None)
+    monkeypatch.setattr(gui, 'make_engine', lambda s, on_event: Engine(1, on_event))
+    monkeypatch.setattr(gui.App, '_ffmpeg_check', lambda self: None)
+    try:
+        a = gui.App()
+    except tkinter.TclError:
+        pytest.skip('no display')
+    a.update()
+    yield a
+    a.destroy()
+
+
+def _tree(w) -> list:
+    return [w] + [d for c in w.winfo_children() for d in _tree(c)]
+
+
+def test_flip_theme_keeps_widgets_and_input(app) -> None:
+    app._url.insert(0, 'https://youtu.be/x')
+    app._dir.insert(0, '/tmp/out')
+    before = _tree(app)
+    icon = app._thm_btn.cget('text')
+
+    app._flip_theme()
+    app.update()
+
+    after = _tree(app)
+    assert len(after) == len(before)
+    assert all(a is b for a, b in zip(after, before))
+    assert app._url.get() == 'https://youtu.be/x'
+    assert app._dir.get() == '/tmp/out'
+    assert app._thm_btn.cget('text') != icon
+    assert ctk.get_appearance_mode() == 'Light'
+
+    app._flip_theme()
+    assert app._thm_btn.cget('text') == icon
@@ -0,0 +1,113 @@
+import time
+import threading
+from typing import Any, Callable
+
+# ─── Adaptive concurrency ───
+_INTERVAL = 5.0
+_GAIN = 0.05
+
+
+class HillClimb:
+    """Nudges one integer knob while measured throughput keeps improving."""
+
+    def __init__(self, value: int, lo: int, hi: int, gain: float = _GAIN) -> None:
+        self.value = max(lo, min(hi, int(value)))
+        self.lo, self.hi = lo, hi
+        self.gain = gain
+        self.best = self.value
+        self.best_tp = 0.0
+        self._dir = 1
+        self._prev: float | None = None
+
+    def reset(self) -> None:
+        self._prev = None
+
+    def observe(self, tp: float) -> int:
+        if tp > self.best_tp:
+            self.best, self.best_tp = self.value, tp
+        if self._prev is not None and tp <= self._prev * (1 + self.gain):
+            # The last step did not pay for itself (or nothing moved): go the other way.
+            self._dir = -self._dir
+        self._prev = tp
+        self.value = max(self.lo, min(self.hi, self.value + self._dir))
+        return self.value
+
+
+class Tuner:
+    """Hill-climbs each busy platform's job cap and segment count.
+
+    The two knobs take turns, one step per interval, so each measurement
+    reflects a single change. A job cap never climbs past the platform's
+    configured cap, and platforms that report no bytes (spotDL) are left
+    alone. The best values go to `save` as the `tune` record that seeds
+    the next session.
+    """
+
+    def __init__(self, engine: Any, tune: dict, save: Callable[[dict], None],
+                 interval: float = _INTERVAL, max_jobs: int = 16, max_segments: int = 16) -> None:
+        self.engine = engine
+        self.tune = dict(tune)
+        self._save = save
+        self.interval = interval
+        self._max = (max_jobs, max_segments)
+        self._bytes: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._knobs: dict[str, tuple[HillClimb, HillClimb]] = {}
+        self._busy: set[str] = set()
+        self._turn = 0
+        for name, rec in self.tune.items():
+            self._knob(name, rec)
+        threading.Thread(target=self._loop, daemon=True, name='tuner').start()
+
+    def _knob(self, name: str, rec: dict | None = None) -> tuple[HillClimb, HillClimb]:
+        k = self._knobs.get(name)
+        if k is None:
+            rec = rec or {}
+            limit = self.engine.sched.limit(name)
+            jobs = HillClimb(rec.get('jobs', limit), 1, min(self._max[0], limit))
+            segs = HillClimb(rec.get('segments', self.engine.segments), 1, self._max[1])
+            k = self._knobs[name] = (jobs, segs)
+            self._apply(name, jobs.value)
+        return k
+
+    def add(self, platform: str, n: int) -> None:
+        if n > 0:
+            with self._lock:
+                self._bytes[platform] = self._bytes.get(platform, 0) + n
+
+    def segments(self, platform: str) -> int:
+        k = self._knobs.get(platform)
+        return k[1].value if k else self.engine.segments
+
+    def _apply(self, platform: str, jobs: int) -> None:
+        for job in self.engine.sched.set_cap(platform, jobs):
+            self.engine.requeue(job)
+        self.engine.resize(max(self.engine.base_workers,
+                               sum(self._knobs[n][0].value for n in self._busy if n in self._knobs)))
+
+    def _loop(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                moved, self._bytes = self._bytes, {}
+            busy = self.engine.sched.stats()['platforms']
+            self._turn ^= 1
+            changed = False
+            self._busy = {n for n, st in busy.items() if st['active'] or st['waiting']}
+            for name in busy:
+                knobs = self._knob(name)
+                if name not in self._busy or not moved.get(name):
+                    # Idle, or no byte feed to measure: hold and start over next time.
+                    for k in knobs:
+                        k.reset()
+                    continue
+                k = knobs[self._turn]
+                before = k.best
+                k.observe(moved.get(name, 0) / self.interval)
+                if self._turn == 0:
+                    self._apply(name, k.value)
+                changed |= k.best != before or name not in self.tune
+            if changed:
+                self.tune.update({n: {'jobs': j.best, 'segments': s.best}
+                                  for n, (j, s) in self._knobs.items() if j.best_tp or s.best_tp})
+                self._save(dict(self.tune))